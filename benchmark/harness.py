@@ -0,0 +1,172 @@
+import gc
+import json
+import logging
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import uuid
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Iterator, Sequence
+
+from climatoology.base.computation import ComputationResources
+
+log = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class BenchmarkCase:
+    """
+    A function to benchmark.
+
+    The optional setup runs before every repetition and is not included in the measurement.
+    """
+
+    name: str
+    func: Callable[[], object]
+    setup: Callable[[], None] | None = None
+
+
+@dataclass(frozen=True)
+class BenchmarkResult:
+    name: str
+    repeat: int
+    min_s: float
+    median_s: float
+    p95_s: float
+    peak_memory_bytes: int
+
+
+@contextmanager
+def local_computation_resources(parent_dir: Path | None = None) -> Iterator[ComputationResources]:
+    """
+    Stand-in for the computation resources of the plugin infrastructure that writes artifacts to a temporary directory.
+
+    :param parent_dir: Directory to create the temporary directory in, e.g. a network mount, the system's default if None
+    """
+    with tempfile.TemporaryDirectory(prefix='ghg_budget_benchmark_', dir=parent_dir) as directory:
+        yield ComputationResources(computation_id=uuid.uuid4(), computation_dir=Path(directory))
+
+
+def summarise(name: str, durations: Sequence[float], peak_memory_bytes: int) -> BenchmarkResult:
+    """
+    :param name: Name of the benchmark case
+    :param durations: Measured durations [s]
+    :param peak_memory_bytes: Peak memory allocated during one run [bytes]
+    :return: Summary statistics of the durations
+    """
+    durations = sorted(durations)
+    p95_index = max(0, round(0.95 * len(durations)) - 1)
+    return BenchmarkResult(
+        name=name,
+        repeat=len(durations),
+        min_s=durations[0],
+        median_s=statistics.median(durations),
+        p95_s=durations[p95_index],
+        peak_memory_bytes=peak_memory_bytes,
+    )
+
+
+def run_case(case: BenchmarkCase, repeat: int, warmup: int = 1) -> BenchmarkResult:
+    """
+    Times a benchmark case and measures its peak memory in a separate run, as tracing memory slows down the function.
+
+    :param case: The benchmark case
+    :param repeat: Number of timed repetitions
+    :param warmup: Number of untimed repetitions before the measurement
+    :return: Summary statistics of the case
+    """
+    for _ in range(warmup):
+        if case.setup:
+            case.setup()
+        case.func()
+
+    durations = []
+    for _ in range(repeat):
+        if case.setup:
+            case.setup()
+        gc.collect()
+        start = time.perf_counter()
+        case.func()
+        durations.append(time.perf_counter() - start)
+
+    if case.setup:
+        case.setup()
+    tracemalloc.start()
+    try:
+        case.func()
+        _, peak_memory = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return summarise(case.name, durations, peak_memory)
+
+
+def run_cold_import(module: str, repeat: int) -> BenchmarkResult:
+    """
+    Measures the import of a module in fresh interpreters.
+
+    :param module: Name of the module to import
+    :param repeat: Number of interpreters to start
+    :return: Summary statistics of the import time and memory
+    """
+    script = (
+        'import json, time, tracemalloc\n'
+        'tracemalloc.start()\n'
+        'start = time.perf_counter()\n'
+        f'import {module}\n'
+        'duration = time.perf_counter() - start\n'
+        'print(json.dumps({"duration": duration, "peak": tracemalloc.get_traced_memory()[1]}))\n'
+    )
+    durations, peaks = [], []
+    for _ in range(repeat):
+        completed = subprocess.run(
+            [sys.executable, '-c', script], check=True, capture_output=True, text=True, cwd=Path.cwd()
+        )
+        measurement = json.loads(completed.stdout.splitlines()[-1])
+        durations.append(measurement['duration'])
+        peaks.append(measurement['peak'])
+    return summarise(f'cold_import[{module}]', durations, max(peaks))
+
+
+def git_commit() -> str | None:
+    try:
+        completed = subprocess.run(['git', 'rev-parse', 'HEAD'], check=True, capture_output=True, text=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return completed.stdout.strip()
+
+
+def write_report(results: Sequence[BenchmarkResult], path: Path) -> None:
+    """
+    Writes the results together with the commit and environment so runs can be compared across commits.
+
+    :param results: Benchmark results
+    :param path: Path of the JSON file
+    """
+    report = {
+        'commit': git_commit(),
+        'created': datetime.now(timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': [asdict(result) for result in results],
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report, indent=2))
+    log.info(f'Wrote benchmark results to {path}')
+
+
+def format_results(results: Sequence[BenchmarkResult]) -> str:
+    lines = [f'{"case":<45} {"repeat":>6} {"min ms":>10} {"median ms":>10} {"p95 ms":>10} {"peak MiB":>9}']
+    for result in results:
+        lines.append(
+            f'{result.name:<45} {result.repeat:>6} {result.min_s * 1000:>10.2f} {result.median_s * 1000:>10.2f} '
+            f'{result.p95_s * 1000:>10.2f} {result.peak_memory_bytes / 2**20:>9.2f}'
+        )
+    return '\n'.join(lines)
@@ -0,0 +1,202 @@
+"""
+Benchmarks of the CO2 budget analysis and the artifact pipeline.
+
+Run from the repository root: poetry run python -m benchmark.run --output benchmark/results/<name>.json
+"""
+
+import argparse
+import functools
+import logging
+from pathlib import Path
+from unittest import mock
+
+import shapely
+from climatoology.base.baseoperator import AoiProperties
+from climatoology.base.plugin_info import DEFAULT_LANGUAGE
+
+from benchmark.harness import (
+    BenchmarkCase,
+    format_results,
+    local_computation_resources,
+    run_case,
+    run_cold_import,
+    write_report,
+)
+from ghg_budget.components.calculate import (
+    ANALYSIS_CACHE,
+    ARTIFACT_CACHE,
+    GROWTH_RATES_CHART_CACHE,
+    budget_params,
+    calculate_bisko_budgets,
+    co2_budget_analysis,
+    cumulative_emissions,
+    current_budget,
+    emission_paths,
+    emission_reduction,
+    cached_artifact_payloads,
+    get_artifacts,
+    year_budget_spent,
+)
+from ghg_budget.components import figures
+from ghg_budget.components.artifact import write_artifacts, write_artifacts_overlapped
+from ghg_budget.components.data import DATA_STORE, GHG_DATA
+from ghg_budget.components.engine import BudgetEngine
+from ghg_budget.core.input import ComputeInput, DetailOption
+from ghg_budget.core.operator_worker import GHGBudget
+
+log = logging.getLogger(__name__)
+
+STEP_CITY = 'Heidelberg'
+HEIDELBERG_AOI = shapely.MultiPolygon([shapely.box(8.65, 49.39, 8.74, 49.43)])
+
+
+def clear_caches() -> None:
+    for cache in (ANALYSIS_CACHE, ARTIFACT_CACHE, GROWTH_RATES_CHART_CACHE):
+        cache.clear()
+
+
+def analysis_cases() -> list[BenchmarkCase]:
+    cities = DATA_STORE.emissions_aoi.columns[2:].tolist()
+    return [
+        BenchmarkCase(f'co2_budget_analysis[{city_name}]', lambda city_name=city_name: co2_budget_analysis(city_name))
+        for city_name in sorted(cities)
+    ]
+
+
+def step_cases() -> list[BenchmarkCase]:
+    emissions_aoi = DATA_STORE.emissions_aoi
+    city_pop_2020 = DATA_STORE.city_pop_2020
+    aoi_pop = int(city_pop_2020.loc[city_pop_2020['city_name'] == STEP_CITY, 'pop_2020'].values[0])
+    aoi_bisko_budgets = calculate_bisko_budgets(
+        GHG_DATA.budget_glob, GHG_DATA.emissions_glob, budget_params, aoi_pop / budget_params.global_pop
+    )
+    emissions_df = cumulative_emissions(emissions_aoi, STEP_CITY)
+    aoi_bisko_budgets = current_budget(emissions_df, aoi_bisko_budgets)
+    spent_budgets, _ = year_budget_spent(aoi_bisko_budgets, emissions_df)
+
+    return [
+        BenchmarkCase(
+            'emission_paths',
+            lambda: emission_paths(spent_budgets, emissions_aoi, budget_params, STEP_CITY),
+        ),
+        BenchmarkCase(
+            'emission_reduction',
+            lambda: emission_reduction(GHG_DATA.emission_reduction_years, emissions_aoi, STEP_CITY, spent_budgets),
+        ),
+        BenchmarkCase('year_budget_spent', lambda: year_budget_spent(aoi_bisko_budgets, emissions_df)),
+        BenchmarkCase('budget_engine.run', BudgetEngine.for_city(STEP_CITY, budget_params=budget_params).run),
+    ]
+
+
+def figure_cases() -> list[BenchmarkCase]:
+    (
+        _,
+        comparison_chart_df,
+        emissions_df,
+        emission_paths_df,
+        emission_reduction_df,
+        linear_decrease,
+        percentage_decrease,
+    ) = co2_budget_analysis(STEP_CITY)
+    end_year = DATA_STORE.registry.end_year(STEP_CITY)
+
+    def build_all_charts():
+        figures.get_comparison_chart(comparison_chart_df, end_year)
+        figures.get_time_chart(emissions_df, emission_paths_df, STEP_CITY, end_year)
+        figures.get_cumulative_chart(emissions_df, STEP_CITY, end_year)
+        figures.get_emission_reduction_chart(emission_reduction_df, linear_decrease, percentage_decrease)
+        figures.get_emission_growth_rates_chart(DATA_STORE.emissions_aoi)
+
+    def build_all_charts_validated():
+        # Same figures, but with every property validated by Plotly as go.Figure does by default
+        validated_build = functools.partial(figures.build_figure, validate=True)
+        with mock.patch.object(figures, 'build_figure', validated_build):
+            build_all_charts()
+
+    return [
+        BenchmarkCase('figures[fast]', build_all_charts),
+        BenchmarkCase('figures[validated]', build_all_charts_validated),
+    ]
+
+
+def artifact_cases(resources) -> list[BenchmarkCase]:
+    analysis = co2_budget_analysis(STEP_CITY)
+    return [
+        BenchmarkCase(
+            f'get_artifacts[{level_of_detail}]',
+            lambda level_of_detail=level_of_detail: get_artifacts(
+                resources,
+                *analysis[:5],
+                STEP_CITY,
+                *analysis[5:],
+                lang=DEFAULT_LANGUAGE,
+                level_of_detail=level_of_detail,
+            ),
+            setup=clear_caches,
+        )
+        for level_of_detail in DetailOption
+    ]
+
+
+def write_cases(resources) -> list[BenchmarkCase]:
+    # Only the file writes, run with --computation-dir on a slow or network mount to see the effect of overlapping them
+    payloads = cached_artifact_payloads(STEP_CITY, lang=DEFAULT_LANGUAGE, level_of_detail=DetailOption.EXTENDED)
+    return [
+        BenchmarkCase('write_artifacts[serial]', lambda: write_artifacts(payloads, resources)),
+        BenchmarkCase('write_artifacts[overlapped]', lambda: write_artifacts_overlapped(payloads, resources)),
+    ]
+
+
+def compute_cases(resources) -> list[BenchmarkCase]:
+    operator = GHGBudget()
+
+    def compute_with_aoi_resolution():
+        # The AOI name is unknown, so the city is resolved from the geometry
+        return operator.compute(
+            resources=resources,
+            aoi=HEIDELBERG_AOI,
+            aoi_properties=AoiProperties(name='Unknown', id='unknown'),
+            params=ComputeInput(level_of_detail=DetailOption.EXTENDED),
+            language=DEFAULT_LANGUAGE,
+        )
+
+    return [
+        BenchmarkCase('GHGBudget.compute[resolve_aoi, cold]', compute_with_aoi_resolution, setup=clear_caches),
+        BenchmarkCase('GHGBudget.compute[resolve_aoi, warm]', compute_with_aoi_resolution),
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=20, help='Timed repetitions per case')
+    parser.add_argument('--import-repeat', type=int, default=5, help='Fresh interpreters for the cold import')
+    parser.add_argument('--filter', default='', help='Only run cases whose name contains this string')
+    parser.add_argument('--output', type=Path, help='Path of the JSON file to write the results to')
+    parser.add_argument(
+        '--computation-dir', type=Path, help='Directory to write the artifacts below, e.g. a network mount'
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    logging.getLogger('ghg_budget').setLevel(logging.WARNING)
+
+    with local_computation_resources(args.computation_dir) as resources:
+        cases = [
+            *analysis_cases(),
+            *step_cases(),
+            *figure_cases(),
+            *artifact_cases(resources),
+            *write_cases(resources),
+            *compute_cases(resources),
+        ]
+        results = [run_case(case, repeat=args.repeat) for case in cases if args.filter in case.name]
+    if args.filter in 'cold_import[ghg_budget.plugin]':
+        results.append(run_cold_import('ghg_budget.plugin', repeat=args.import_repeat))
+
+    print(format_results(results))
+    if args.output:
+        write_report(results, args.output)
+
+
+if __name__ == '__main__':
+    main()
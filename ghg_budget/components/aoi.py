@@ -0,0 +1,82 @@
+import functools
+import logging
+from pathlib import Path
+from typing import Sequence
+
+import numpy as np
+import shapely
+
+from ghg_budget.components.static_resources import get_static_resources
+
+log = logging.getLogger(__name__)
+
+
+class CityResolver:
+    """
+    Resolves AOIs to the supported city they lie within.
+
+    The city geometries are prepared and indexed in an STRtree once. A query first collects the cities whose envelope
+    intersects the AOI, then rejects all cities whose bounding box does not contain the bounding box of the AOI and only
+    tests exact containment for the remaining candidates.
+    """
+
+    def __init__(self, names: Sequence[str], geometries: Sequence[shapely.Geometry]):
+        self.names = np.asarray(names, dtype=object)
+        self.geometries = np.asarray(geometries, dtype=object)
+        shapely.prepare(self.geometries)
+        self.bounds = shapely.bounds(self.geometries)
+        self.tree = shapely.STRtree(self.geometries)
+
+    @classmethod
+    def from_file(cls, path: Path) -> 'CityResolver':
+        """
+        :param path: Path to a vector file with the city geometries and their names in the column 'name'
+        :return: Resolver for the cities in the file
+        """
+        # geopandas is only needed to read the file and takes long to import
+        import geopandas as gpd
+
+        cities = gpd.read_file(path)
+        return cls(cities['name'].tolist(), cities.geometry.to_numpy())
+
+    def resolve_many(self, aois: Sequence[shapely.Geometry]) -> list[str | None]:
+        """
+        :param aois: AOIs to resolve
+        :return: Name of the city each AOI lies within, None if it lies within none or several city geometries
+        """
+        aois = np.asarray(aois, dtype=object)
+        aoi_index, city_index = self.tree.query(aois)
+
+        aoi_bounds = shapely.bounds(aois)[aoi_index]
+        city_bounds = self.bounds[city_index]
+        bbox_contained = np.all(city_bounds[:, :2] <= aoi_bounds[:, :2], axis=1) & np.all(
+            city_bounds[:, 2:] >= aoi_bounds[:, 2:], axis=1
+        )
+        aoi_index, city_index = aoi_index[bbox_contained], city_index[bbox_contained]
+
+        contained = shapely.contains(self.geometries[city_index], aois[aoi_index])
+        aoi_index, city_index = aoi_index[contained], city_index[contained]
+
+        n_matches = np.bincount(aoi_index, minlength=aois.size)
+        resolved = [None] * aois.size
+        for aoi_position, city_position in zip(aoi_index, city_index):
+            if n_matches[aoi_position] == 1:
+                resolved[aoi_position] = self.names[city_position]
+        return resolved
+
+    def resolve(self, aoi: shapely.Geometry) -> str | None:
+        """
+        :param aoi: AOI to resolve
+        :return: Name of the city the AOI lies within, None if it lies within none or several city geometries
+        """
+        return self.resolve_many([aoi])[0]
+
+
+@functools.cache
+def get_city_resolver() -> CityResolver:
+    """
+    :return: Resolver for the supported cities, built once per process
+    """
+    cities_path = get_static_resources().cities_path
+    log.debug(f'Building city resolver from {cities_path}')
+    return CityResolver.from_file(cities_path)
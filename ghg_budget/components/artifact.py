@@ -1,3 +1,12 @@
+import asyncio
+import functools
+import gzip
+import shutil
+import tempfile
+from dataclasses import dataclass
+from enum import StrEnum
+from pathlib import Path
+
 import pandas as pd
 from climatoology.base.artifact import Artifact, ArtifactMetadata
 from climatoology.base.artifact_creators import (
@@ -8,28 +17,195 @@ from climatoology.base.artifact_creators import (
 from climatoology.base.computation import ComputationResources
 from climatoology.base.i18n import tr, translate_dataframe
 from plotly.graph_objects import Figure
+from pydantic_extra_types.language_code import LanguageAlpha2
 
 from ghg_budget.components.data import NOW_YEAR, EMISSION_PROJECTION_CITIES
+from ghg_budget.components.executor import run_coroutine, run_ordered
+from ghg_budget.components.figures import compact_figure
+from ghg_budget.components.timing import span
+
+# The metadata texts only depend on the language, the city and a few numbers. They are rendered once per combination
+# and shared between all payloads, which treat them as read-only.
+METADATA_CACHE_SIZE = 64
+GZIP_SUFFIX = '.gz'
+
+
+class ArtifactKind(StrEnum):
+    MARKDOWN = 'markdown'
+    TABLE = 'table'
+    CHART = 'chart'
+
+
+@dataclass(frozen=True)
+class ArtifactPayload:
+    """
+    Fully built content and metadata of an artifact that only needs to be written into the computation resources.
+
+    Payloads do not depend on the computation resources and may therefore be cached and written for several
+    computations. They are treated as read-only.
+    """
+
+    kind: ArtifactKind
+    metadata: ArtifactMetadata
+    content: str | pd.DataFrame | Figure
+
+
+@dataclass(frozen=True)
+class ArtifactEncoding:
+    """
+    How the artifacts are encoded into files.
+    """
+
+    # Round the chart data to the displayed precision and store whole numbers as integer typed arrays
+    compact_charts: bool = False
+    # Additionally write a gzip-compressed copy <file>.gz of every artifact file, for file servers to send as is
+    gzip: bool = False
+
+
+DEFAULT_ENCODING = ArtifactEncoding()
 
 
-def build_methodology_description_simple_artifact(text: str, resources: ComputationResources) -> Artifact:
-    methodology_description_simple_artifact_metadata = ArtifactMetadata(
+def write_artifact(
+    payload: ArtifactPayload, resources: ComputationResources, encoding: ArtifactEncoding = DEFAULT_ENCODING
+) -> Artifact:
+    """
+    :param payload: The artifact to write
+    :param resources: The plugin computation resources
+    :param encoding: How to encode the artifact into files
+    :return: The artifact written into the computation directory
+    """
+    with span(f'write_artifact.{payload.metadata.filename}'):
+        match payload.kind:
+            case ArtifactKind.MARKDOWN:
+                artifact = create_markdown_artifact(
+                    text=payload.content, metadata=payload.metadata, resources=resources
+                )
+            case ArtifactKind.TABLE:
+                artifact = create_table_artifact(data=payload.content, metadata=payload.metadata, resources=resources)
+            case ArtifactKind.CHART:
+                figure = compact_figure(payload.content) if encoding.compact_charts else payload.content
+                artifact = create_plotly_chart_artifact(figure=figure, metadata=payload.metadata, resources=resources)
+            case _:
+                raise NotImplementedError(f'{payload.kind} not yet supported')
+        if encoding.gzip:
+            gzip_artifact_files(payload.metadata.filename, resources.computation_dir)
+        return artifact
+
+
+def gzip_artifact_files(filename: str, directory: Path) -> None:
+    """
+    Writes a gzip-compressed copy next to each file of an artifact. The copies do not depend on the time they are
+    written at, so identical artifacts are compressed to identical files.
+
+    :param filename: File name of the artifact without extension, as in its metadata
+    :param directory: Directory the artifact was written to
+    """
+    for path in directory.glob(f'{filename}.*'):
+        if path.suffix != GZIP_SUFFIX:
+            path.with_name(path.name + GZIP_SUFFIX).write_bytes(gzip.compress(path.read_bytes(), mtime=0))
+
+
+def write_artifacts(
+    payloads: list[ArtifactPayload],
+    resources: ComputationResources,
+    max_workers: int = 1,
+    encoding: ArtifactEncoding = DEFAULT_ENCODING,
+) -> list[Artifact]:
+    """
+    :param payloads: The artifacts to write
+    :param resources: The plugin computation resources
+    :param max_workers: Number of threads to write the artifacts with, 1 writes them serially
+    :param encoding: How to encode the artifacts into files
+    :return: The artifacts written into the computation directory, in the same order
+    """
+    tasks = [functools.partial(write_artifact, payload, resources, encoding) for payload in payloads]
+    return run_ordered(tasks, max_workers=max_workers)
+
+
+async def write_artifacts_async(
+    payloads: list[ArtifactPayload],
+    resources: ComputationResources,
+    staging_dir: Path | None = None,
+    encoding: ArtifactEncoding = DEFAULT_ENCODING,
+) -> list[Artifact]:
+    """
+    Serializes the artifacts one after another into a local staging directory and copies the files of each artifact into
+    the computation directory in the background, while the next artifact is serialized.
+
+    The copies of all artifacts run concurrently, which hides the latency of slow or network-mounted computation
+    directories. The artifacts only refer to their files by name, so they are valid in the computation directory.
+
+    :param payloads: The artifacts to write
+    :param resources: The plugin computation resources
+    :param staging_dir: Local directory to serialize the artifacts into, the system's temporary directory by default
+    :param encoding: How to encode the artifacts into files
+    :return: The artifacts written into the computation directory, in the same order
+    """
+    with tempfile.TemporaryDirectory(prefix='ghg_budget_artifacts_', dir=staging_dir) as staging:
+        artifacts = []
+        copies = []
+        try:
+            for position, payload in enumerate(payloads):
+                payload_dir = Path(staging) / str(position)
+                payload_dir.mkdir()
+                artifacts.append(
+                    write_artifact(payload, resources.model_copy(update={'computation_dir': payload_dir}), encoding)
+                )
+                copies.extend(
+                    asyncio.create_task(asyncio.to_thread(shutil.copyfile, path, resources.computation_dir / path.name))
+                    for path in payload_dir.iterdir()
+                )
+                # Hand the new copies to the threads before the next artifact blocks the event loop
+                await asyncio.sleep(0)
+        finally:
+            # The staging directory must outlive all copies, even if serializing an artifact failed
+            with span('write_artifacts.copy'):
+                results = await asyncio.gather(*copies, return_exceptions=True)
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+    return artifacts
+
+
+def write_artifacts_overlapped(
+    payloads: list[ArtifactPayload], resources: ComputationResources, encoding: ArtifactEncoding = DEFAULT_ENCODING
+) -> list[Artifact]:
+    """
+    Synchronous facade of write_artifacts_async.
+
+    :param payloads: The artifacts to write
+    :param resources: The plugin computation resources
+    :param encoding: How to encode the artifacts into files
+    :return: The artifacts written into the computation directory, in the same order
+    """
+    return run_coroutine(write_artifacts_async(payloads, resources, encoding=encoding))
+
+
+def build_methodology_description_simple_artifact(text: str, lang: LanguageAlpha2) -> ArtifactPayload:
+    methodology_description_simple_artifact_metadata = methodology_description_simple_metadata(lang)
+    return ArtifactPayload(
+        kind=ArtifactKind.MARKDOWN, metadata=methodology_description_simple_artifact_metadata, content=text
+    )
+
+
+@functools.lru_cache(maxsize=METADATA_CACHE_SIZE)
+def methodology_description_simple_metadata(lang: LanguageAlpha2) -> ArtifactMetadata:
+    return ArtifactMetadata(
         name=tr('Calculation of the CO₂-budget'),
         summary=tr(' '),
         filename='simple_methodology_description',
     )
 
-    result = create_markdown_artifact(
-        text=text,
-        metadata=methodology_description_simple_artifact_metadata,
-        resources=resources,
-    )
-    return result
-
 
 def build_time_chart_artifact(
-    line_chart: Figure, resources: ComputationResources, city_name: str, aoi_emission_end_year: int
-) -> Artifact:
+    line_chart: Figure, city_name: str, aoi_emission_end_year: int, lang: LanguageAlpha2
+) -> ArtifactPayload:
+    time_chart_artifact_metadata = time_chart_metadata(lang, city_name, aoi_emission_end_year)
+    return ArtifactPayload(kind=ArtifactKind.CHART, metadata=time_chart_artifact_metadata, content=line_chart)
+
+
+@functools.lru_cache(maxsize=METADATA_CACHE_SIZE)
+def time_chart_metadata(lang: LanguageAlpha2, city_name: str, aoi_emission_end_year: int) -> ArtifactMetadata:
     name = tr('Development of the CO₂-emissions in {city_name}').format(city_name=city_name)
     summary = tr(
         'Development of the CO₂-emissions in {city_name} and alternative reduction paths since 2016 by maintaining '
@@ -66,26 +242,24 @@ def build_time_chart_artifact(
         ).format(city_name=city_name)
         description = f'{description_pre_warning}\n\n{description}'
 
-    time_chart_artifact_metadata = ArtifactMetadata(
+    return ArtifactMetadata(
         name=name,
         summary=summary,
         description=description,
         filename='time_chart',
     )
 
-    result = create_plotly_chart_artifact(
-        figure=line_chart,
-        metadata=time_chart_artifact_metadata,
-        resources=resources,
-    )
-    return result
-
 
-def build_budget_table_artifact(table: pd.DataFrame, resources: ComputationResources, city_name: str) -> Artifact:
+def build_budget_table_artifact(table: pd.DataFrame, city_name: str, lang: LanguageAlpha2) -> ArtifactPayload:
     latest_column_name = tr('{NOW_YEAR} BISKO CO₂-budget (1000 tons)').format(NOW_YEAR=NOW_YEAR)
     table = table.rename(columns={'BISKO CO₂-budget now (1000 tons)': latest_column_name})
     table = translate_dataframe(table)
+    budget_table_artifact_metadata = budget_table_metadata(lang, city_name)
+    return ArtifactPayload(kind=ArtifactKind.TABLE, metadata=budget_table_artifact_metadata, content=table)
 
+
+@functools.lru_cache(maxsize=METADATA_CACHE_SIZE)
+def budget_table_metadata(lang: LanguageAlpha2, city_name: str) -> ArtifactMetadata:
     name = tr('{city_name} CO₂ budget').format(city_name=city_name)
     summary = tr('How much of the CO₂-budget of {city_name} is already consumed?').format(city_name=city_name)
     description_intro = tr(
@@ -160,28 +334,24 @@ def build_budget_table_artifact(table: pd.DataFrame, resources: ComputationResou
     )
     description = description.format(city_name=city_name, NOW_YEAR=NOW_YEAR)
 
-    budget_table_artifact_metadata = ArtifactMetadata(
+    return ArtifactMetadata(
         name=name,
         summary=summary,
         description=description,
         filename='ghg_budget_table',
     )
 
-    result = create_table_artifact(
-        data=table,
-        metadata=budget_table_artifact_metadata,
-        resources=resources,
-    )
-    return result
-
 
-def build_budget_table_simple_artifact(
-    table: pd.DataFrame, resources: ComputationResources, city_name: str
-) -> Artifact:
+def build_budget_table_simple_artifact(table: pd.DataFrame, city_name: str, lang: LanguageAlpha2) -> ArtifactPayload:
     latest_column_name = tr('BISKO CO₂-budget {NOW_YEAR} (1000 tons)').format(NOW_YEAR=NOW_YEAR)
     table = table.rename(columns={'BISKO CO₂-budget now (1000 tons)': latest_column_name})
     table = translate_dataframe(table)
+    budget_table_simple_artifact_metadata = budget_table_simple_metadata(lang, city_name)
+    return ArtifactPayload(kind=ArtifactKind.TABLE, metadata=budget_table_simple_artifact_metadata, content=table)
+
 
+@functools.lru_cache(maxsize=METADATA_CACHE_SIZE)
+def budget_table_simple_metadata(lang: LanguageAlpha2, city_name: str) -> ArtifactMetadata:
     name = tr('{city_name} CO₂ budget').format(city_name=city_name)
     summary = tr('How much of the CO₂-budget of {city_name} is already consumed?').format(city_name=city_name)
 
@@ -243,23 +413,25 @@ def build_budget_table_simple_artifact(
     )
     description = description.format(city_name=city_name, NOW_YEAR=NOW_YEAR)
 
-    budget_table_simple_artifact_metadata = ArtifactMetadata(
+    return ArtifactMetadata(
         name=name,
         summary=summary,
         description=description,
         filename='simple_ghg_budget_table',
     )
-    result = create_table_artifact(
-        data=table,
-        metadata=budget_table_simple_artifact_metadata,
-        resources=resources,
-    )
-    return result
 
 
 def build_budget_comparison_chart_artifact(
-    fig: Figure, resources: ComputationResources, city_name: str, aoi_emission_end_year: int
-) -> Artifact:
+    fig: Figure, city_name: str, aoi_emission_end_year: int, lang: LanguageAlpha2
+) -> ArtifactPayload:
+    budget_comparison_chart_artifact_metadata = budget_comparison_chart_metadata(lang, city_name, aoi_emission_end_year)
+    return ArtifactPayload(kind=ArtifactKind.CHART, metadata=budget_comparison_chart_artifact_metadata, content=fig)
+
+
+@functools.lru_cache(maxsize=METADATA_CACHE_SIZE)
+def budget_comparison_chart_metadata(
+    lang: LanguageAlpha2, city_name: str, aoi_emission_end_year: int
+) -> ArtifactMetadata:
     name = tr('How much CO₂-budget has already been emitted?')
     summary = tr(
         "The share of {city_name}'s emissions on the global CO₂-emission that, with an  83 % probability, would keep "
@@ -291,23 +463,23 @@ def build_budget_comparison_chart_artifact(
         ).format(city_name=city_name)
         description = f'{description_pre_warning}\n\n{description}'
 
-    budget_comparison_chart_artifact_metadata = ArtifactMetadata(
+    return ArtifactMetadata(
         name=name,
         summary=summary,
         description=description,
         filename='comparison_emissions_budgets',
     )
-    result = create_plotly_chart_artifact(
-        figure=fig,
-        metadata=budget_comparison_chart_artifact_metadata,
-        resources=resources,
-    )
-    return result
 
 
 def build_cumulative_chart_artifact(
-    fig: Figure, resources: ComputationResources, city_name: str, aoi_emission_end_year: int
-) -> Artifact:
+    fig: Figure, city_name: str, aoi_emission_end_year: int, lang: LanguageAlpha2
+) -> ArtifactPayload:
+    cumulative_chart_artifact_metadata = cumulative_chart_metadata(lang, city_name, aoi_emission_end_year)
+    return ArtifactPayload(kind=ArtifactKind.CHART, metadata=cumulative_chart_artifact_metadata, content=fig)
+
+
+@functools.lru_cache(maxsize=METADATA_CACHE_SIZE)
+def cumulative_chart_metadata(lang: LanguageAlpha2, city_name: str, aoi_emission_end_year: int) -> ArtifactMetadata:
     name = tr('Cumulative CO₂-emissions in {city_name}').format(city_name=city_name)
     summary = tr('Total CO₂-emissions in {city_name} per year since 2016 (in 1000 tons)').format(city_name=city_name)
 
@@ -345,29 +517,32 @@ def build_cumulative_chart_artifact(
         ).format(city_name=city_name)
         description = f'{description_pre_warning}\n\n{description}'
 
-    cumulative_chart_artifact_metadata = ArtifactMetadata(
+    return ArtifactMetadata(
         name=name,
         summary=summary,
         description=description,
         filename='cumulative_chart',
     )
-    result = create_plotly_chart_artifact(
-        figure=fig,
-        metadata=cumulative_chart_artifact_metadata,
-        resources=resources,
-    )
-    return result
 
 
 def build_emission_reduction_chart_artifact(
     fig: Figure,
-    resources: ComputationResources,
     city_name: str,
     aoi_bisko_budgets: pd.DataFrame,
     percentage_decrease: int,
-) -> Artifact:
+    lang: LanguageAlpha2,
+) -> ArtifactPayload:
     bisko_budget_now_year = aoi_bisko_budgets['BISKO CO₂-budget now (1000 tons)'].iloc[-1]
+    emission_reduction_chart_artifact_metadata = emission_reduction_chart_metadata(
+        lang, city_name, bisko_budget_now_year, percentage_decrease
+    )
+    return ArtifactPayload(kind=ArtifactKind.CHART, metadata=emission_reduction_chart_artifact_metadata, content=fig)
+
 
+@functools.lru_cache(maxsize=METADATA_CACHE_SIZE)
+def emission_reduction_chart_metadata(
+    lang: LanguageAlpha2, city_name: str, bisko_budget_now_year: float, percentage_decrease: int
+) -> ArtifactMetadata:
     name = tr('CO₂-emission reduction paths for {city_name}').format(city_name=city_name)
     summary = tr(
         'Selection of potential CO₂-reduction paths of {city_name} that stay below the temperature threshold of 2°C '
@@ -406,24 +581,21 @@ def build_emission_reduction_chart_artifact(
         percentage_decrease=percentage_decrease,
     )
 
-    emission_reduction_chart_artifact_metadata = ArtifactMetadata(
+    return ArtifactMetadata(
         name=name,
         summary=summary,
         description=description,
         filename='emission_reduction_chart',
     )
-    result = create_plotly_chart_artifact(
-        figure=fig,
-        metadata=emission_reduction_chart_artifact_metadata,
-        resources=resources,
-    )
-    return result
 
 
-def build_emissions_growth_rates_chart_artifact(
-    fig: Figure,
-    resources: ComputationResources,
-) -> Artifact:
+def build_emissions_growth_rates_chart_artifact(fig: Figure, lang: LanguageAlpha2) -> ArtifactPayload:
+    emissions_growth_rates_artifact_metadata = emissions_growth_rates_chart_metadata(lang)
+    return ArtifactPayload(kind=ArtifactKind.CHART, metadata=emissions_growth_rates_artifact_metadata, content=fig)
+
+
+@functools.lru_cache(maxsize=METADATA_CACHE_SIZE)
+def emissions_growth_rates_chart_metadata(lang: LanguageAlpha2) -> ArtifactMetadata:
     name = tr('Comparison of CO₂-emission reduction')
     summary = tr('Average yearly reduction rate of CO₂-emissions from 2016 to {NOW_YEAR}').format(NOW_YEAR=NOW_YEAR)
 
@@ -442,15 +614,29 @@ def build_emissions_growth_rates_chart_artifact(
     description = '\n\n'.join([description_main, description_remark])
     description = description.format(NOW_YEAR=NOW_YEAR)
 
-    emissions_growth_rates_artifact_metadata = ArtifactMetadata(
+    return ArtifactMetadata(
         name=name,
         summary=summary,
         description=description,
         filename='emissions_growth_rates',
     )
-    result = create_plotly_chart_artifact(
-        figure=fig,
-        metadata=emissions_growth_rates_artifact_metadata,
-        resources=resources,
-    )
-    return result
+
+
+def prerender_artifact_metadata(lang: LanguageAlpha2, aoi_emission_end_years: dict[str, int]) -> None:
+    """
+    Renders the metadata texts of all artifacts that only depend on the language and the AOI, e.g. at startup.
+
+    The texts of the emission reduction chart depend on the results of the analysis and are rendered on first use. The
+    translation of the language has to be active, as during a compute request.
+
+    :param lang: Language of the texts
+    :param aoi_emission_end_years: Last year for which emission data is available, per AOI
+    """
+    methodology_description_simple_metadata(lang)
+    emissions_growth_rates_chart_metadata(lang)
+    for city_name, aoi_emission_end_year in aoi_emission_end_years.items():
+        budget_table_metadata(lang, city_name)
+        budget_table_simple_metadata(lang, city_name)
+        time_chart_metadata(lang, city_name, aoi_emission_end_year)
+        budget_comparison_chart_metadata(lang, city_name, aoi_emission_end_year)
+        cumulative_chart_metadata(lang, city_name, aoi_emission_end_year)
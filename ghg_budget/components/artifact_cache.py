@@ -0,0 +1,205 @@
+import json
+import logging
+import os
+import shutil
+import tempfile
+import time
+import uuid
+from pathlib import Path
+from typing import Callable
+
+from climatoology.base.artifact import Artifact
+from climatoology.base.computation import ComputationResources
+
+from ghg_budget.components.artifact import DEFAULT_ENCODING, ArtifactEncoding, ArtifactPayload, write_artifacts
+from ghg_budget.components.timing import span
+
+log = logging.getLogger(__name__)
+
+MANIFEST_FILENAME = 'artifacts.json'
+STAGING_DIR = 'staging'
+TRASH_DIR = 'trash'
+# Staging directories of writers that crashed are removed after this time
+STALE_STAGING_S = 3600
+
+
+class ArtifactDiskCache:
+    """
+    Content-addressed on-disk cache of written artifacts, shared by all worker processes of a host.
+
+    Each entry is a directory named by its key that holds the artifact files and a manifest of the artifacts. Entries
+    are written into a staging directory and renamed into place, so other processes only ever see complete entries.
+    Entries are never modified after they have been published. They are evicted least recently used first as soon as
+    the cache grows beyond its size limit, by renaming them out of place before deleting them.
+
+    Cached files are hard-linked into the computation directory where possible. The files in the computation
+    directory must therefore be treated as read-only, which they are once the artifacts have been returned.
+    """
+
+    def __init__(self, directory: Path, max_bytes: int):
+        """
+        :param directory: Directory of the cache, created if it does not exist
+        :param max_bytes: Size limit of all entries
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        for subdirectory in (STAGING_DIR, TRASH_DIR):
+            (self.directory / subdirectory).mkdir(parents=True, exist_ok=True)
+
+    def get_or_write(
+        self,
+        key: str,
+        build_payloads: Callable[[], list[ArtifactPayload]],
+        resources: ComputationResources,
+        max_workers: int = 1,
+        encoding: ArtifactEncoding = DEFAULT_ENCODING,
+    ) -> list[Artifact]:
+        """
+        Places the cached artifacts of the key into the computation directory or writes and caches them.
+
+        :param key: Content address of the artifacts, e.g. a fingerprint of everything they depend on
+        :param build_payloads: Function to build the artifacts in case of a cache miss
+        :param resources: The plugin computation resources
+        :param max_workers: Number of threads to write the artifacts with in case of a cache miss
+        :param encoding: How to encode the artifacts into files in case of a cache miss, has to be part of the key
+        :return: The artifacts placed into the computation directory, in the same order
+        """
+        artifacts = self._load(key, resources)
+        if artifacts is not None:
+            log.debug(f'Artifact disk cache hit for {key}')
+            return artifacts
+
+        log.debug(f'Artifact disk cache miss for {key}')
+        with span('artifact_cache.write'):
+            entry = self._write_entry(key, build_payloads, resources, max_workers, encoding)
+        artifacts = self._load(key, resources)
+        if artifacts is None:
+            # The entry was evicted in the meantime
+            artifacts = write_artifacts(build_payloads(), resources, max_workers=max_workers, encoding=encoding)
+        if entry is not None:
+            self.evict()
+        return artifacts
+
+    def entry_dir(self, key: str) -> Path:
+        return self.directory / key[:2] / key
+
+    def size(self) -> int:
+        """
+        :return: Size of all entries in bytes
+        """
+        return sum(size for _, _, size in self._entries())
+
+    def evict(self) -> None:
+        """
+        Removes the least recently used entries until the cache fits its size limit, and left-over staging directories.
+        """
+        entries = sorted(self._entries())
+        total = sum(size for _, _, size in entries)
+        for _, entry, size in entries:
+            if total <= self.max_bytes:
+                break
+            log.debug(f'Evicting {entry.name} from the artifact disk cache')
+            self._remove(entry)
+            total -= size
+
+        for staging in (self.directory / STAGING_DIR).iterdir():
+            try:
+                if time.time() - staging.stat().st_mtime > STALE_STAGING_S:
+                    self._remove(staging)
+            except FileNotFoundError:
+                pass
+
+    def _load(self, key: str, resources: ComputationResources) -> list[Artifact] | None:
+        entry = self.entry_dir(key)
+        placed = []
+        try:
+            with span('artifact_cache.load'):
+                manifest = json.loads((entry / MANIFEST_FILENAME).read_text())
+                for filename in manifest['files']:
+                    target = resources.computation_dir / filename
+                    link_or_copy(entry / filename, target)
+                    placed.append(target)
+                os.utime(entry)
+        except FileNotFoundError:
+            # The entry was evicted while it was placed, remove the files placed so far
+            for target in placed:
+                target.unlink(missing_ok=True)
+            return None
+        return [Artifact.model_validate(artifact) for artifact in manifest['artifacts']]
+
+    def _write_entry(
+        self,
+        key: str,
+        build_payloads: Callable[[], list[ArtifactPayload]],
+        resources: ComputationResources,
+        max_workers: int,
+        encoding: ArtifactEncoding,
+    ) -> Path | None:
+        staging = Path(tempfile.mkdtemp(prefix=f'{key}.', dir=self.directory / STAGING_DIR))
+        try:
+            artifacts = write_artifacts(
+                build_payloads(),
+                resources.model_copy(update={'computation_dir': staging}),
+                max_workers=max_workers,
+                encoding=encoding,
+            )
+            manifest = {
+                'files': sorted(path.name for path in staging.iterdir()),
+                'artifacts': [artifact.model_dump(mode='json') for artifact in artifacts],
+            }
+            (staging / MANIFEST_FILENAME).write_text(json.dumps(manifest))
+
+            entry = self.entry_dir(key)
+            entry.parent.mkdir(exist_ok=True)
+            try:
+                staging.rename(entry)
+            except OSError:
+                # Another process published the entry first
+                if not (entry / MANIFEST_FILENAME).exists():
+                    raise
+                return None
+            return entry
+        finally:
+            if staging.exists():
+                shutil.rmtree(staging, ignore_errors=True)
+
+    def _entries(self) -> list[tuple[float, Path, int]]:
+        """
+        :return: Last use, directory and size of every published entry
+        """
+        entries = []
+        for shard in self.directory.iterdir():
+            if shard.name in (STAGING_DIR, TRASH_DIR) or not shard.is_dir():
+                continue
+            for entry in shard.iterdir():
+                try:
+                    last_used = entry.stat().st_mtime
+                    size = sum(path.stat().st_size for path in entry.iterdir())
+                except FileNotFoundError:
+                    continue
+                entries.append((last_used, entry, size))
+        return entries
+
+    def _remove(self, path: Path) -> None:
+        trash = self.directory / TRASH_DIR / f'{path.name}.{uuid.uuid4().hex}'
+        try:
+            path.rename(trash)
+        except FileNotFoundError:
+            return
+        shutil.rmtree(trash, ignore_errors=True)
+
+
+def link_or_copy(source: Path, target: Path) -> None:
+    """
+    Hard-links the file to the target or copies it if the file system does not support links between both paths.
+
+    :param source: Existing file
+    :param target: Path of the new file
+    """
+    try:
+        os.link(source, target)
+    except FileNotFoundError:
+        # The source has been evicted, copying would fail as well
+        raise
+    except OSError:
+        shutil.copyfile(source, target)
@@ -0,0 +1,83 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, NamedTuple, TypeVar
+
+import pandas as pd
+from pydantic import BaseModel
+
+T = TypeVar('T')
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class LRUCache:
+    """
+    Thread-safe in-process least-recently-used cache with hit and miss counters.
+    """
+
+    def __init__(self, maxsize: int = 32):
+        assert maxsize > 0, 'The cache needs to hold at least one entry.'
+        self.maxsize = maxsize
+        self._entries: OrderedDict[Hashable, Any] = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], T]) -> T:
+        """
+        :param key: Key of the entry
+        :param compute: Function to compute the entry in case of a cache miss
+        :return: The cached or freshly computed entry
+        """
+        with self._lock:
+            if key in self._entries:
+                self._hits += 1
+                self._entries.move_to_end(key)
+                return self._entries[key]
+            self._misses += 1
+
+        value = compute()
+
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return value
+
+    def info(self) -> CacheInfo:
+        with self._lock:
+            return CacheInfo(hits=self._hits, misses=self._misses, maxsize=self.maxsize, currsize=len(self._entries))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._hits = 0
+            self._misses = 0
+
+
+def fingerprint(*objects: Any) -> str:
+    """
+    Creates a content fingerprint of the given objects, e.g. of the input data of a computation.
+
+    :param objects: DataFrames, pydantic models or objects with a stable representation
+    :return: Hex digest that changes whenever the content of one of the objects changes
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for obj in objects:
+        if isinstance(obj, pd.DataFrame):
+            digest.update(repr(obj.columns.tolist()).encode())
+            for values in [obj.index.to_numpy(), *(obj[column].to_numpy() for column in obj.columns)]:
+                digest.update(str(values.dtype).encode())
+                digest.update(repr(values.tolist()).encode() if values.dtype == object else values.tobytes())
+        elif isinstance(obj, BaseModel):
+            digest.update(obj.model_dump_json().encode())
+        else:
+            digest.update(repr(obj).encode())
+    return digest.hexdigest()
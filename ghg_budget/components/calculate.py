@@ -1,10 +1,10 @@
+import functools
+import importlib.metadata
 import logging
-from pathlib import Path
 from typing import Tuple
 
 import numpy as np
 import pandas as pd
-import sympy as sp
 from climatoology.base.artifact import Artifact
 from climatoology.base.computation import ComputationResources
 from climatoology.base.i18n import N_, tr
@@ -13,6 +13,10 @@ from pydantic_extra_types.language_code import LanguageAlpha2
 
 from ghg_budget.core.input import DetailOption
 from ghg_budget.components.artifact import (
+    DEFAULT_ENCODING,
+    ArtifactEncoding,
+    ArtifactPayload,
+    write_artifacts,
     build_budget_table_artifact,
     build_time_chart_artifact,
     build_methodology_description_simple_artifact,
@@ -22,13 +26,24 @@ from ghg_budget.components.artifact import (
     build_cumulative_chart_artifact,
     build_emissions_growth_rates_chart_artifact,
 )
+from ghg_budget.components.cache import LRUCache, fingerprint
+from ghg_budget.components.engine import (
+    EMISSION_PATH_PROBABILITY,
+    BudgetEngine,
+    BudgetExhaustionIndex,
+    BudgetResult,
+    emission_path_coefficients,
+    evaluate_emission_paths,
+    reduction_scenarios,
+)
+from ghg_budget.components.executor import run_ordered
+from ghg_budget.components.static_resources import get_static_resources
+from ghg_budget.components.timing import span
 from ghg_budget.components.data import (
     BudgetParams,
     GHG_DATA,
     NOW_YEAR,
-    aoi_emission_end_years,
-    emissions_aoi,
-    city_pop_2020,
+    DATA_STORE,
 )
 from ghg_budget.components.figures import (
     get_comparison_chart,
@@ -38,39 +53,113 @@ from ghg_budget.components.figures import (
     get_emission_growth_rates_chart,
 )
 
-PROJECT_DIR = Path(__file__).parent.parent.parent
 budget_params = BudgetParams()
+ANALYSIS_CACHE = LRUCache(maxsize=32)
+ARTIFACT_CACHE = LRUCache(maxsize=64)
+GROWTH_RATES_CHART_CACHE = LRUCache(maxsize=8)
 
 log = logging.getLogger(__name__)
 
 
 def co2_budget_analysis(city_name: str):
     log.debug('Starting CO2 budget analysis...')
-    aoi_pop = int(city_pop_2020.loc[city_pop_2020['city_name'] == city_name, 'pop_2020'].values[0])
-    aoi_pop_share = aoi_pop / budget_params.global_pop
+    with span('calculate.budget_engine'):
+        result = BudgetEngine.for_city(city_name, budget_params=budget_params).run()
+    with span('calculate.result_tables'):
+        tables = budget_result_tables(result, city_name)
+    log.debug('Finished CO2 budget analysis')
+    return tables
+
+
+def budget_result_tables(result: BudgetResult, city_name: str) -> tuple:
+    """
+    Builds the tables the artifacts are created from out of the numeric results of the CO2 budget analysis.
 
-    aoi_bisko_budgets = calculate_bisko_budgets(
-        GHG_DATA.budget_glob, GHG_DATA.emissions_glob, budget_params=budget_params, aoi_pop_share=aoi_pop_share
+    :param result: Results of the CO2 budget analysis of the AOI
+    :param city_name: Name of the AOI
+    :return: CO2 budgets, comparison chart data, emissions, emission paths and emission reduction scenarios of the AOI,
+        the yearly linear [kt] and percentage decrease [%] of the emission reduction scenarios
+    """
+    emissions_df = cumulative_emissions(DATA_STORE.emissions_aoi, city_name)
+
+    aoi_bisko_budgets = GHG_DATA.budget_glob[['Temperature threshold (°C)', 'Probability']].copy()
+    aoi_bisko_budgets[N_('BISKO CO₂-budget 2016 (1000 tons)')] = result.bisko_budgets_2016
+    aoi_bisko_budgets['BISKO CO₂-budget now (1000 tons)'] = result.bisko_budgets_now
+    aoi_bisko_budgets[N_('CO₂-budget consumed (year)')] = consumed_year_column(
+        result.consumed_year, emissions_df['Year'].dtype
     )
 
-    emissions_df = cumulative_emissions(emissions_aoi, city_name)
-    aoi_bisko_budgets = current_budget(emissions_df, aoi_bisko_budgets)
-    aoi_bisko_budgets, emissions_df = year_budget_spent(aoi_bisko_budgets, emissions_df)
+    path_rows = aoi_bisko_budgets['Probability'] == EMISSION_PATH_PROBABILITY
+    comparison_chart_df = comparison_chart_table(
+        aoi_bisko_budgets.loc[path_rows, 'Temperature threshold (°C)'].to_numpy(),
+        result.bisko_budgets_2016[path_rows.to_numpy()],
+        result.reported_emissions,
+        result.projected_emissions,
+    )
 
-    comparison_chart_df = comparison_chart_data(emissions_aoi, aoi_bisko_budgets, city_name)
-    emission_paths_df = emission_paths(aoi_bisko_budgets, emissions_aoi, budget_params, city_name)
-    emission_reduction_df, linear_decrease, percentage_decrease = emission_reduction(
-        GHG_DATA.emission_reduction_years, emissions_aoi, city_name, aoi_bisko_budgets
+    emission_paths_df = pd.DataFrame(
+        {
+            'Year': result.emission_path_years,
+            N_('1.7 °C'): result.emission_paths[:, 0],
+            N_('2.0 °C'): result.emission_paths[:, 1],
+        }
+    )
+    emission_reduction_df = pd.DataFrame(
+        {
+            'Year': result.reduction_years,
+            'decrease_linear': result.decrease_linear,
+            'decrease_percentage': result.decrease_percentage,
+            'business_as_usual': result.business_as_usual,
+        }
     )
-    log.debug('Finished CO2 budget analysis')
     return (
         aoi_bisko_budgets,
         comparison_chart_df,
         emissions_df,
         emission_paths_df,
         emission_reduction_df,
-        linear_decrease,
-        percentage_decrease,
+        result.linear_decrease,
+        result.percentage_decrease,
+    )
+
+
+def cached_co2_budget_analysis(city_name: str) -> tuple:
+    """
+    Memoized version of co2_budget_analysis.
+
+    Results are cached per city and fingerprint of the input data, which includes the year of the analysis. Every call
+    receives its own copies of the result tables, so callers may modify them without affecting the cache.
+
+    :param city_name: Name of the AOI
+    :return: Result of co2_budget_analysis
+    """
+    key = (city_name, analysis_fingerprint())
+    result = ANALYSIS_CACHE.get_or_compute(key, lambda: co2_budget_analysis(city_name))
+    return tuple(value.copy() if isinstance(value, pd.DataFrame) else value for value in result)
+
+
+def analysis_fingerprint() -> str:
+    """
+    The data tables are hashed once when the data store loads them, so the fingerprint is cheap to look up per request.
+
+    :return: Fingerprint of all data and parameters the CO2 budget analysis depends on, including the year it uses
+    """
+    return parameters_fingerprint(DATA_STORE.fingerprint())
+
+
+@functools.lru_cache(maxsize=4)
+def parameters_fingerprint(data_fingerprint: str) -> str:
+    """
+    :param data_fingerprint: Fingerprint of the data tables of the data store
+    :return: Fingerprint of the data tables combined with the read-only module-level parameters and data
+    """
+    return fingerprint(
+        budget_params,
+        GHG_DATA.budget_glob,
+        GHG_DATA.emissions_glob,
+        GHG_DATA.emission_reduction_years,
+        data_fingerprint,
+        NOW_YEAR,
     )
 
 
@@ -86,16 +175,16 @@ def calculate_bisko_budgets(
     :param aoi_pop_share: Population of AOI divided by global population
     :return: pd.DataFrame with CO2 budgets of the AOI depending on warming goals and probabilities of reaching them
     """
-    budget_glob['emission_sum'] = (
+    emission_sum = (
         emissions_glob.loc[budget_params.pledge_year : budget_params.ipcc_date.year - 1, 'emissions_t'].sum() / 1000
     )
-    budget_glob['budget_emission_sum'] = budget_glob['budget_glob'] + budget_glob['emission_sum']
-    budget_glob['budget_aoi'] = budget_glob['budget_emission_sum'] * aoi_pop_share
+    budget_emission_sum = budget_glob['budget_glob'] + emission_sum
+    budget_aoi = budget_emission_sum * aoi_pop_share
     assert 0 < budget_params.bisko_factor < 1, (
         'The BISKO factor is not between 0 and 1. Please check the population and emission data.'
     )
-    budget_glob[N_('BISKO CO₂-budget 2016 (1000 tons)')] = budget_glob['budget_aoi'] * budget_params.bisko_factor
-    aoi_bisko = budget_glob[['Temperature threshold (°C)', 'Probability', 'BISKO CO₂-budget 2016 (1000 tons)']].copy()
+    aoi_bisko = budget_glob[['Temperature threshold (°C)', 'Probability']].copy()
+    aoi_bisko[N_('BISKO CO₂-budget 2016 (1000 tons)')] = budget_aoi * budget_params.bisko_factor
     return aoi_bisko
 
 
@@ -107,12 +196,15 @@ def cumulative_emissions(emissions_aoi: pd.DataFrame, city_name: str) -> pd.Data
     :param city_name: name of the AOI
     :return: pd.DataFrame with past and projected yearly CO2 emissions in the AOI and cumulative emissions per year
     """
-    estimation = emissions_aoi[emissions_aoi['category'] == 'estimation'][['Year', city_name]].copy()
-    projection = emissions_aoi[emissions_aoi['category'] == 'projection'][['Year', city_name]].copy()
-
-    emissions_df = pd.concat([estimation, projection])
-    emissions_df['cumulative_emissions'] = emissions_df[city_name].cumsum()
-    return emissions_df
+    registry = DATA_STORE.registry_for(emissions_aoi)
+    return pd.DataFrame(
+        {
+            'Year': registry.ordered_years,
+            city_name: registry.ordered_emissions(city_name),
+            'cumulative_emissions': registry.cumulative_emissions(city_name),
+        },
+        index=registry.ordered_index,
+    )
 
 
 def current_budget(emissions_df: pd.DataFrame, aoi_bisko_budgets: pd.DataFrame) -> pd.DataFrame:
@@ -125,6 +217,7 @@ def current_budget(emissions_df: pd.DataFrame, aoi_bisko_budgets: pd.DataFrame)
     """
     current_cumulative_emissions = emissions_df.loc[emissions_df['Year'] == NOW_YEAR, 'cumulative_emissions'].values[0]
 
+    aoi_bisko_budgets = aoi_bisko_budgets.copy()
     aoi_bisko_budgets['BISKO CO₂-budget now (1000 tons)'] = (
         aoi_bisko_budgets['BISKO CO₂-budget 2016 (1000 tons)'] - current_cumulative_emissions
     )
@@ -141,24 +234,33 @@ def year_budget_spent(aoi_bisko_budgets: pd.DataFrame, emissions_df: pd.DataFram
     :return: pd.DataFrame with CO2 emissions of the AOI from pledge_year onwards
     """
 
-    def find_year(budget):
-        spent_years = emissions_df[emissions_df['cumulative_emissions'] > budget]
-        if not spent_years.empty:
-            return spent_years.iloc[0]['Year']
-        else:
-            return None
-
-    aoi_bisko_budgets[N_('CO₂-budget consumed (year)')] = aoi_bisko_budgets['BISKO CO₂-budget 2016 (1000 tons)'].apply(
-        find_year
+    exhaustion_index = BudgetExhaustionIndex(
+        emissions_df['Year'].to_numpy(), emissions_df['cumulative_emissions'].to_numpy()
     )
+    consumed_year = exhaustion_index.year_spent(aoi_bisko_budgets['BISKO CO₂-budget 2016 (1000 tons)'].to_numpy())
 
-    aoi_bisko_budgets['CO₂-budget consumed (year)'] = (
-        aoi_bisko_budgets['CO₂-budget consumed (year)'].replace([np.inf, -np.inf], np.nan).fillna(N_('is not consumed'))
+    aoi_bisko_budgets = aoi_bisko_budgets.copy()
+    aoi_bisko_budgets[N_('CO₂-budget consumed (year)')] = consumed_year_column(
+        consumed_year, emissions_df['Year'].dtype
     )
 
     return aoi_bisko_budgets, emissions_df
 
 
+def consumed_year_column(consumed_year: np.ndarray, years_dtype: np.dtype) -> np.ndarray:
+    """
+    :param consumed_year: Years in which the CO2 budgets are consumed, NaN if they are not consumed
+    :param years_dtype: dtype of the years of the emissions
+    :return: Column for the CO2 budget table with the years in years_dtype, marking budgets that are not consumed
+    """
+    consumed = np.isfinite(consumed_year)
+    if consumed.all():
+        return consumed_year.astype(years_dtype)
+    column = np.full(consumed_year.shape, N_('is not consumed'), dtype=object)
+    column[consumed] = consumed_year[consumed].astype(years_dtype).tolist()
+    return column
+
+
 def comparison_chart_data(emissions_aoi: pd.DataFrame, aoi_bisko_budgets: pd.DataFrame, city_name: str) -> pd.DataFrame:
     """
     Prepares data for bar chart comparing CO2 budgets depending on warming goals with planned emissions of the AOI.
@@ -168,21 +270,37 @@ def comparison_chart_data(emissions_aoi: pd.DataFrame, aoi_bisko_budgets: pd.Dat
     :param city_name: Name of the AOI
     :return: pd.DataFrame with CO2 budgets depending on warming goals and total planned emissions of the AOI
     """
-    estimation = emissions_aoi[emissions_aoi['category'] == 'estimation'][['Year', city_name]].copy()
-    estimate_emissions = estimation[city_name].sum()
-    projection = emissions_aoi[emissions_aoi['category'] == 'projection'][['Year', city_name]].copy()
-    planned_emissions = projection[city_name].sum()
-    aoi_bisko_budgets = aoi_bisko_budgets[aoi_bisko_budgets['Probability'] == '83 %'].reset_index()
-    comparison_chart_df = aoi_bisko_budgets[['Temperature threshold (°C)', 'BISKO CO₂-budget 2016 (1000 tons)']].copy()
-    comparison_chart_df['Temperature threshold (°C)'] = comparison_chart_df['Temperature threshold (°C)'].apply(
-        lambda x: f'{x:.1f}'.replace('.', tr('.'))
+    estimate_emissions, planned_emissions = DATA_STORE.registry_for(emissions_aoi).emission_totals(city_name)
+    aoi_bisko_budgets = aoi_bisko_budgets[aoi_bisko_budgets['Probability'] == EMISSION_PATH_PROBABILITY]
+    return comparison_chart_table(
+        aoi_bisko_budgets['Temperature threshold (°C)'].to_numpy(),
+        aoi_bisko_budgets['BISKO CO₂-budget 2016 (1000 tons)'].to_numpy(),
+        estimate_emissions,
+        planned_emissions,
     )
-    comparison_chart_df.loc[len(comparison_chart_df)] = ['Reported', estimate_emissions]
-    comparison_chart_df.loc[len(comparison_chart_df)] = ['Projection', planned_emissions]
-    comparison_chart_df['Temperature threshold (°C)'] = comparison_chart_df['Temperature threshold (°C)'].apply(
-        lambda deg: f'{deg} °C' if deg not in ['Reported', 'Projection'] else deg
+
+
+def comparison_chart_table(
+    temperature_thresholds: np.ndarray, budgets: np.ndarray, estimate_emissions: float, planned_emissions: float
+) -> pd.DataFrame:
+    """
+    :param temperature_thresholds: Temperature thresholds [°C] of the CO2 budgets
+    :param budgets: CO2 budgets [kt] of the AOI in the pledge_year, with 83 % probability
+    :param estimate_emissions: Sum of the reported CO2 emissions [kt] of the AOI
+    :param planned_emissions: Sum of the projected CO2 emissions [kt] of the AOI
+    :return: pd.DataFrame with CO2 budgets depending on warming goals and total planned emissions of the AOI. The
+        labels are untranslated, so the table can be cached for all languages; get_comparison_chart translates them.
+    """
+    return pd.DataFrame(
+        {
+            'Temperature threshold (°C)': [
+                *(f'{threshold:.1f} °C' for threshold in temperature_thresholds),
+                'Reported',
+                'Projection',
+            ],
+            'BISKO CO₂-budget 2016 (1000 tons)': np.r_[budgets, estimate_emissions, planned_emissions],
+        }
     )
-    return comparison_chart_df
 
 
 def simplify_table(aoi_bisko_budgets: pd.DataFrame) -> pd.DataFrame:
@@ -214,7 +332,6 @@ def emission_paths(
     :param city_name: Name of the AOI
     :return: pd.DataFrame with projected yearly emissions of the AOI and alternative reduction paths
     """
-    bisko_budget_table.reset_index(inplace=False)
     budget_1point7 = bisko_budget_table.loc[
         (bisko_budget_table['Temperature threshold (°C)'] == 1.7) & (bisko_budget_table['Probability'] == '83 %'),
         'BISKO CO₂-budget 2016 (1000 tons)',
@@ -223,36 +340,17 @@ def emission_paths(
         (bisko_budget_table['Temperature threshold (°C)'] == 2.0) & (bisko_budget_table['Probability'] == '83 %'),
         'BISKO CO₂-budget 2016 (1000 tons)',
     ].values[0]
-    emissions_pledge_year = emission_table.loc[emission_table['Year'] == budget_params.pledge_year, city_name]
-
-    x = sp.symbols('x')
-    a, b, c, d = sp.symbols('a b c d')
-
-    f = a * x**3 + b * x**2 + c * x + d
-    df = sp.diff(f, x)
-
-    eq1 = f.subs(x, budget_params.pledge_year) - emissions_pledge_year
-
-    eq2 = f.subs(x, budget_params.zero_year)
-
-    integral = sp.integrate(f, (x, budget_params.pledge_year, budget_params.zero_year))
-    eq3_1point7 = integral - budget_1point7
-    eq3_2point0 = integral - budget_2point0
-
-    eq4 = df.subs(x, budget_params.zero_year)
-
-    solution_1point7 = sp.solve([eq1, eq2, eq3_1point7, eq4], (a, b, c, d))
-    solution_2point0 = sp.solve([eq1, eq2, eq3_2point0, eq4], (a, b, c, d))
-
-    f_solved_1point7 = f.subs(solution_1point7)
-    f_solved_2point0 = f.subs(solution_2point0)
+    emissions_pledge_year = DATA_STORE.registry_for(emission_table).emission(city_name, budget_params.pledge_year)
 
-    f_numeric_1point7 = sp.lambdify(x, f_solved_1point7, modules='numpy')
-    f_numeric_2point0 = sp.lambdify(x, f_solved_2point0, modules='numpy')
+    coefficients = emission_path_coefficients(
+        np.array([budget_1point7, budget_2point0]),
+        emissions_pledge_year,
+        budget_params.pledge_year,
+        budget_params.zero_year,
+    )
 
     x_vals = np.arange(budget_params.pledge_year, 2041)
-    y_1point7 = f_numeric_1point7(x_vals)
-    y_2point0 = f_numeric_2point0(x_vals)
+    y_1point7, y_2point0 = evaluate_emission_paths(coefficients, x_vals, budget_params.pledge_year).T
 
     emission_paths_df = pd.DataFrame({'Year': x_vals, N_('1.7 °C'): y_1point7, N_('2.0 °C'): y_2point0})
 
@@ -276,52 +374,90 @@ def emission_reduction(
     :return: Yearly decrease of CO2 emissions [%] in the percentage decrease scenario
     """
     start_year, end_year = year_range
-    year_list = list(range(start_year, end_year + 1))
-    current_emission = emissions_aoi.loc[emissions_aoi['Year'] == start_year, city_name].values[0]
-
-    decrease_scenario = current_emission
-    percentage_scenario = current_emission
-    emission_sum = current_emission
+    years = np.arange(start_year, end_year + 1)
+    current_emission = DATA_STORE.registry_for(emissions_aoi).emission(city_name, start_year)
 
     bisko_budget_now_2c_83p = aoi_bisko_budgets['BISKO CO₂-budget now (1000 tons)'].iloc[-1]
-    n_years = round((2 * bisko_budget_now_2c_83p) / current_emission)
-    linear_decrease = current_emission / (n_years - 1)
-    percentage_decrease = int(current_emission / bisko_budget_now_2c_83p * 100)
-    threshold_exceeded = False
-
-    emission_reduction_df = pd.DataFrame({'Year': year_list})
-    emission_reduction_df.loc[0, 'decrease_linear'] = current_emission
-    emission_reduction_df.loc[0, 'decrease_percentage'] = current_emission
-    emission_reduction_df.loc[0, 'business_as_usual'] = current_emission
-
-    for year in year_list[1:]:
-        # Linear emission decrease scenario
-        if decrease_scenario > 0:
-            decrease_scenario -= linear_decrease
-            emission_reduction_df.loc[emission_reduction_df['Year'] == year, 'decrease_linear'] = round(
-                decrease_scenario, 1
-            )
-        else:
-            emission_reduction_df.loc[emission_reduction_df['Year'] == year, 'decrease_linear'] = None
+    decrease_linear, decrease_percentage, business_as_usual, linear_decrease, percentage_decrease = reduction_scenarios(
+        years, current_emission, bisko_budget_now_2c_83p
+    )
+
+    emission_reduction_df = pd.DataFrame(
+        {
+            'Year': years,
+            'decrease_linear': decrease_linear,
+            'decrease_percentage': decrease_percentage,
+            'business_as_usual': business_as_usual,
+        }
+    )
+
+    return emission_reduction_df, linear_decrease, percentage_decrease
+
+
+def cached_artifact_payloads(
+    city_name: str, lang: LanguageAlpha2, level_of_detail: DetailOption, max_workers: int = 1
+) -> list[ArtifactPayload]:
+    """
+    Builds the artifact payloads for the AOI or takes them from the cache.
+
+    The payloads only depend on the city, language, level of detail, input data and year of the analysis, so a cache
+    hit only requires writing them into the computation resources.
+
+    :param city_name: Name of the AOI
+    :param lang: Output language requested
+    :param level_of_detail: The level of detail requested
+    :param max_workers: Number of threads to build the artifacts with in case of a cache miss
+    :return: Artifact payloads in the order they are returned to the user
+    """
 
-        # Percentage emission decrease scenario
-        percentage_scenario *= 1 - current_emission / bisko_budget_now_2c_83p
-        emission_reduction_df.loc[emission_reduction_df['Year'] == year, 'decrease_percentage'] = round(
-            percentage_scenario, 1
+    def build_payloads() -> list[ArtifactPayload]:
+        (
+            aoi_bisko_budgets,
+            comparison_chart_df,
+            emissions_df,
+            emission_paths_df,
+            emission_reduction_df,
+            linear_decrease,
+            percentage_decrease,
+        ) = cached_co2_budget_analysis(city_name)
+        return get_artifact_payloads(
+            aoi_bisko_budgets,
+            comparison_chart_df,
+            emissions_df,
+            emission_paths_df,
+            emission_reduction_df,
+            city_name,
+            linear_decrease,
+            percentage_decrease,
+            lang=lang,
+            level_of_detail=level_of_detail,
+            max_workers=max_workers,
         )
 
-        # Business as usual scenario
-        emission_sum += current_emission
-        if not threshold_exceeded:
-            if emission_sum < bisko_budget_now_2c_83p:
-                emission_reduction_df.loc[emission_reduction_df['Year'] == year, 'business_as_usual'] = current_emission
-            else:
-                emission_reduction_df.loc[emission_reduction_df['Year'] == year, 'business_as_usual'] = 0
-                threshold_exceeded = True
-        else:
-            emission_reduction_df.loc[emission_reduction_df['Year'] == year, 'business_as_usual'] = None
+    key = (city_name, lang, level_of_detail, analysis_fingerprint())
+    return list(ARTIFACT_CACHE.get_or_compute(key, build_payloads))
+
+
+def artifact_cache_key(
+    city_name: str, lang: LanguageAlpha2, level_of_detail: DetailOption, encoding: ArtifactEncoding = DEFAULT_ENCODING
+) -> str:
+    """
+    :param city_name: Name of the AOI
+    :param lang: Output language requested
+    :param level_of_detail: The level of detail requested
+    :param encoding: How the artifacts are encoded into files
+    :return: Content address of the artifacts of the request, changes with the input data, the year of the analysis
+        and the plugin version
+    """
+    return fingerprint(city_name, lang, level_of_detail, encoding, analysis_fingerprint(), plugin_version())
 
-    return emission_reduction_df, linear_decrease, percentage_decrease
+
+@functools.cache
+def plugin_version() -> str:
+    try:
+        return importlib.metadata.version('ghg_budget')
+    except importlib.metadata.PackageNotFoundError:
+        return 'unknown'
 
 
 def get_artifacts(
@@ -336,8 +472,12 @@ def get_artifacts(
     percentage_decrease: int,
     lang: LanguageAlpha2,
     level_of_detail: DetailOption,
+    max_workers: int = 1,
+    encoding: ArtifactEncoding = DEFAULT_ENCODING,
 ) -> list[Artifact]:
     """
+    :param encoding: How to encode the artifacts into files
+    :param max_workers: Number of threads to build and write the artifacts with, 1 builds and writes them serially
     :param level_of_detail: The level of detail requested
     :param lang: Output language requested
     :param percentage_decrease: Yearly decrease of CO2 emissions [%] in the percentage decrease scenario
@@ -350,81 +490,135 @@ def get_artifacts(
     :param emission_reduction_df: pd.DataFrame with three different emission reduction scenarios to meet the goal of 2°C warming
     :param city_name: Name of the AOI
     """
+    payloads = get_artifact_payloads(
+        aoi_bisko_budgets,
+        comparison_chart_df,
+        emissions_df,
+        emission_paths_df,
+        emission_reduction_df,
+        city_name,
+        linear_decrease,
+        percentage_decrease,
+        lang=lang,
+        level_of_detail=level_of_detail,
+        max_workers=max_workers,
+    )
+    return write_artifacts(payloads, resources, max_workers=max_workers, encoding=encoding)
 
-    aoi_emission_end_year = aoi_emission_end_years.loc[
-        aoi_emission_end_years['city_name'] == city_name, 'end_year'
-    ].values[0]
-
-    log.debug('Creating bar chart with development of the emissions in the AOI as chart artifact.')
-    time_chart_figure = get_time_chart(emissions_df, emission_paths_df, city_name, aoi_emission_end_year)
-    time_chart_artifact = build_time_chart_artifact(time_chart_figure, resources, city_name, aoi_emission_end_year)
 
-    artifacts = [time_chart_artifact]
+def get_artifact_payloads(
+    aoi_bisko_budgets: pd.DataFrame,
+    comparison_chart_df: pd.DataFrame,
+    emissions_df: pd.DataFrame,
+    emission_paths_df: pd.DataFrame,
+    emission_reduction_df: pd.DataFrame,
+    city_name: str,
+    linear_decrease: int,
+    percentage_decrease: int,
+    lang: LanguageAlpha2,
+    level_of_detail: DetailOption,
+    max_workers: int = 1,
+) -> list[ArtifactPayload]:
+    """
+    :param max_workers: Number of threads to build the artifacts with, 1 builds them serially
+    :param level_of_detail: The level of detail requested
+    :param lang: Output language requested
+    :param percentage_decrease: Yearly decrease of CO2 emissions [%] in the percentage decrease scenario
+    :param linear_decrease: Yearly decrease of CO2 emissions [kt] in the linear decrease scenario
+    :param aoi_bisko_budgets: Table with BISKO CO2 budgets of the AOI from the pledge_year onwards
+    :param comparison_chart_df: Dataframe with different GHG budgets and planned GHG emissions
+    :param emissions_df: pd.DataFrame with CO2 emissions of the AOI from pledge_year onwards
+    :param emission_paths_df: pd.DataFrame with projected yearly emissions of the AOI and alternative reduction paths
+    :param emission_reduction_df: pd.DataFrame with three different emission reduction scenarios to meet the goal of 2°C warming
+    :param city_name: Name of the AOI
+    """
+    aoi_emission_end_year = DATA_STORE.registry.end_year(city_name)
+
+    time_chart_task = functools.partial(
+        get_time_chart_artifact,
+        aoi_emission_end_year=aoi_emission_end_year,
+        city_name=city_name,
+        emissions_df=emissions_df,
+        emission_paths_df=emission_paths_df,
+        lang=lang,
+    )
 
     match level_of_detail:
         case DetailOption.SIMPLE:
-            markdown_simple_artifact = get_simple_methodology(lang=lang, resources=resources)
-            table_simple_artifact = get_simple_table(
-                aoi_bisko_budgets=aoi_bisko_budgets, city_name=city_name, resources=resources
-            )
-
-            artifacts = [
-                markdown_simple_artifact,
-                table_simple_artifact,
-            ] + artifacts
+            tasks = [
+                functools.partial(get_simple_methodology, lang=lang),
+                functools.partial(
+                    get_simple_table, aoi_bisko_budgets=aoi_bisko_budgets, city_name=city_name, lang=lang
+                ),
+                time_chart_task,
+            ]
 
         case DetailOption.EXTENDED:
             aoi_bisko_budgets, table_artifact = get_table_artifact(
-                aoi_bisko_budgets=aoi_bisko_budgets, city_name=city_name, resources=resources
+                aoi_bisko_budgets=aoi_bisko_budgets, city_name=city_name, lang=lang
             )
 
-            comparison_chart_artifact = get_comparison_chart_artifact(
-                aoi_emission_end_year=aoi_emission_end_year,
-                city_name=city_name,
-                comparison_chart_df=comparison_chart_df,
-                resources=resources,
-            )
-            cumulative_chart_artifact = get_cumulative_chart_artifact(
-                aoi_emission_end_year=aoi_emission_end_year,
-                city_name=city_name,
-                emissions_df=emissions_df,
-                resources=resources,
-            )
+            tasks = [
+                lambda: table_artifact,
+                functools.partial(
+                    get_comparison_chart_artifact,
+                    aoi_emission_end_year=aoi_emission_end_year,
+                    city_name=city_name,
+                    comparison_chart_df=comparison_chart_df,
+                    lang=lang,
+                ),
+                time_chart_task,
+                functools.partial(
+                    get_cumulative_chart_artifact,
+                    aoi_emission_end_year=aoi_emission_end_year,
+                    city_name=city_name,
+                    emissions_df=emissions_df,
+                    lang=lang,
+                ),
+                functools.partial(
+                    get_emission_reduction_chart_artifact,
+                    aoi_bisko_budgets=aoi_bisko_budgets,
+                    city_name=city_name,
+                    emission_reduction_df=emission_reduction_df,
+                    linear_decrease=linear_decrease,
+                    percentage_decrease=percentage_decrease,
+                    lang=lang,
+                ),
+                functools.partial(get_emission_growth_rate_chart_artifact, lang=lang),
+            ]
 
-            emission_reduction_chart_artifact = get_emission_reduction_chart_artifact(
-                aoi_bisko_budgets=aoi_bisko_budgets,
-                city_name=city_name,
-                emission_reduction_df=emission_reduction_df,
-                linear_decrease=linear_decrease,
-                percentage_decrease=percentage_decrease,
-                resources=resources,
-            )
+        case _:
+            raise NotImplementedError(f'{level_of_detail} not yet supported')
 
-            emission_growth_rates_chart_artifact = get_emission_growth_rate_chart_artifact(resources=resources)
+    return run_ordered(tasks, max_workers=max_workers)
 
-            artifacts = (
-                [table_artifact, comparison_chart_artifact]
-                + artifacts
-                + [
-                    cumulative_chart_artifact,
-                    emission_reduction_chart_artifact,
-                    emission_growth_rates_chart_artifact,
-                ]
-            )
 
-        case _:
-            raise NotImplementedError(f'{level_of_detail} not yet supported')
+def get_time_chart_artifact(
+    aoi_emission_end_year, city_name: str, emissions_df: DataFrame, emission_paths_df: DataFrame, lang: LanguageAlpha2
+) -> ArtifactPayload:
+    log.debug('Creating bar chart with development of the emissions in the AOI as chart artifact.')
+    with span('figure.time_chart'):
+        time_chart_figure = get_time_chart(emissions_df, emission_paths_df, city_name, aoi_emission_end_year)
+    time_chart_artifact = build_time_chart_artifact(time_chart_figure, city_name, aoi_emission_end_year, lang=lang)
+    return time_chart_artifact
 
-    return artifacts
 
+def get_emission_growth_rate_chart_artifact(lang: LanguageAlpha2) -> ArtifactPayload:
+    """
+    The chart covers all AOIs and is the same for every request, so it is built once per language and input data.
 
-def get_emission_growth_rate_chart_artifact(resources: ComputationResources) -> Artifact:
-    log.debug('Creating bar chart with emission growth rate for all AOIs as chart artifact.')
-    emission_growth_rates_chart_data = get_emission_growth_rates_chart(emissions_aoi)
-    emission_growth_rates_chart_artifact = build_emissions_growth_rates_chart_artifact(
-        emission_growth_rates_chart_data, resources
-    )
-    return emission_growth_rates_chart_artifact
+    :param lang: Output language requested
+    :return: Bar chart with the emission growth rate of all AOIs
+    """
+
+    def build_artifact() -> ArtifactPayload:
+        log.debug('Creating bar chart with emission growth rate for all AOIs as chart artifact.')
+        with span('figure.emission_growth_rates_chart'):
+            emission_growth_rates_chart_data = get_emission_growth_rates_chart(DATA_STORE.emissions_aoi)
+        return build_emissions_growth_rates_chart_artifact(emission_growth_rates_chart_data, lang=lang)
+
+    key = (lang, analysis_fingerprint())
+    return GROWTH_RATES_CHART_CACHE.get_or_compute(key, build_artifact)
 
 
 def get_emission_reduction_chart_artifact(
@@ -433,67 +627,69 @@ def get_emission_reduction_chart_artifact(
     emission_reduction_df: DataFrame,
     linear_decrease: int,
     percentage_decrease: int,
-    resources: ComputationResources,
-) -> Artifact:
+    lang: LanguageAlpha2,
+) -> ArtifactPayload:
     log.debug('Creating line chart with possible emission reduction paths in the AOI as chart artifact.')
-    emission_reduction_chart_data = get_emission_reduction_chart(
-        emission_reduction_df, linear_decrease, percentage_decrease
-    )
+    with span('figure.emission_reduction_chart'):
+        emission_reduction_chart_data = get_emission_reduction_chart(
+            emission_reduction_df, linear_decrease, percentage_decrease
+        )
     emission_reduction_chart_artifact = build_emission_reduction_chart_artifact(
-        emission_reduction_chart_data, resources, city_name, aoi_bisko_budgets, percentage_decrease
+        emission_reduction_chart_data, city_name, aoi_bisko_budgets, percentage_decrease, lang=lang
     )
     return emission_reduction_chart_artifact
 
 
 def get_cumulative_chart_artifact(
-    aoi_emission_end_year, city_name: str, emissions_df: DataFrame, resources: ComputationResources
-) -> Artifact:
+    aoi_emission_end_year, city_name: str, emissions_df: DataFrame, lang: LanguageAlpha2
+) -> ArtifactPayload:
     log.debug('Creating bar chart with development of cumulative emissions in the AOI as chart artifact.')
-    cumulative_chart_data = get_cumulative_chart(emissions_df, city_name, aoi_emission_end_year)
+    with span('figure.cumulative_chart'):
+        cumulative_chart_data = get_cumulative_chart(emissions_df, city_name, aoi_emission_end_year)
     cumulative_chart_artifact = build_cumulative_chart_artifact(
-        cumulative_chart_data, resources, city_name, aoi_emission_end_year
+        cumulative_chart_data, city_name, aoi_emission_end_year, lang=lang
     )
     return cumulative_chart_artifact
 
 
 def get_comparison_chart_artifact(
-    aoi_emission_end_year, city_name: str, comparison_chart_df: DataFrame, resources: ComputationResources
-) -> Artifact:
+    aoi_emission_end_year, city_name: str, comparison_chart_df: DataFrame, lang: LanguageAlpha2
+) -> ArtifactPayload:
     log.debug('Creating bar chart with different GHG budgets and planned GHG emissions as chart artifact.')
-    comparison_chart_data = get_comparison_chart(comparison_chart_df, aoi_emission_end_year)
+    with span('figure.comparison_chart'):
+        comparison_chart_data = get_comparison_chart(comparison_chart_df, aoi_emission_end_year)
     comparison_chart_artifact = build_budget_comparison_chart_artifact(
-        comparison_chart_data, resources, city_name, aoi_emission_end_year
+        comparison_chart_data, city_name, aoi_emission_end_year, lang=lang
     )
     return comparison_chart_artifact
 
 
 def get_table_artifact(
-    aoi_bisko_budgets: DataFrame, city_name: str, resources: ComputationResources
-) -> tuple[DataFrame, Artifact]:
+    aoi_bisko_budgets: DataFrame, city_name: str, lang: LanguageAlpha2
+) -> tuple[DataFrame, ArtifactPayload]:
     log.debug('Creating table with the BISKO CO2 budgets of the AOI from the pledge_year onwards as table artifact.')
-    aoi_bisko_budgets = format_table_data(aoi_bisko_budgets)
-    table_artifact = build_budget_table_artifact(aoi_bisko_budgets, resources, city_name)
+    with span('calculate.format_table_data'):
+        aoi_bisko_budgets = format_table_data(aoi_bisko_budgets)
+    table_artifact = build_budget_table_artifact(aoi_bisko_budgets, city_name, lang=lang)
     return aoi_bisko_budgets, table_artifact
 
 
-def get_simple_table(aoi_bisko_budgets: DataFrame, city_name: str, resources: ComputationResources) -> Artifact:
+def get_simple_table(aoi_bisko_budgets: DataFrame, city_name: str, lang: LanguageAlpha2) -> ArtifactPayload:
     log.debug(
         'Creating simplified table with the BISKO CO2 budgets of the AOI from the pledge_year onwards as table '
         'artifact.'
     )
-    aoi_bisko_budgets_simple = simplify_table(aoi_bisko_budgets)
-    table_simple_artifact = build_budget_table_simple_artifact(aoi_bisko_budgets_simple, resources, city_name)
+    with span('calculate.simplify_table'):
+        aoi_bisko_budgets_simple = simplify_table(aoi_bisko_budgets)
+    table_simple_artifact = build_budget_table_simple_artifact(aoi_bisko_budgets_simple, city_name, lang=lang)
     return table_simple_artifact
 
 
-def get_simple_methodology(lang: LanguageAlpha2, resources: ComputationResources) -> Artifact:
+def get_simple_methodology(lang: LanguageAlpha2) -> ArtifactPayload:
     log.debug('Creating methodology description of the plugin in simple language as Markdown artifact.')
-    methodology_simple_path = PROJECT_DIR / f'resources/locales/{lang}/methodology_simple.md'
-    if not methodology_simple_path.exists():
-        methodology_simple_path = PROJECT_DIR / 'resources/locales/en/methodology_simple.md'
-    text = methodology_simple_path.read_text()
+    text = get_static_resources().methodology_simple(lang)
 
-    markdown_simple_artifact = build_methodology_description_simple_artifact(text, resources)
+    markdown_simple_artifact = build_methodology_description_simple_artifact(text, lang=lang)
     return markdown_simple_artifact
 
 
@@ -504,6 +700,7 @@ def format_table_data(aoi_bisko_budgets: DataFrame) -> DataFrame:
     :param aoi_bisko_budgets: Table with BISKO CO2 budgets of the AOI from the pledge_year onwards
     :return: Formatted table with rounded values, decimal commas instead of decimal points, etc.
     """
+    aoi_bisko_budgets = aoi_bisko_budgets.copy()
     aoi_bisko_budgets['BISKO CO₂-budget 2016 (1000 tons)'] = aoi_bisko_budgets[
         'BISKO CO₂-budget 2016 (1000 tons)'
     ].round(1)
@@ -514,5 +711,4 @@ def format_table_data(aoi_bisko_budgets: DataFrame) -> DataFrame:
         lambda x: int(x) if isinstance(x, (float, int)) else x
     )
     aoi_bisko_budgets = aoi_bisko_budgets.map(lambda x: f'{x:.1f}'.replace('.', tr('.')) if isinstance(x, float) else x)
-    aoi_bisko_budgets.set_index('Temperature threshold (°C)', inplace=True)
-    return aoi_bisko_budgets
+    return aoi_bisko_budgets.set_index('Temperature threshold (°C)')
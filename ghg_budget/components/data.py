@@ -1,22 +1,403 @@
 import datetime
+import hashlib
+import logging
+import os
+import tempfile
+import threading
 from dataclasses import dataclass
+from pathlib import Path
 from typing import Tuple
 
+import numpy as np
 import pandas as pd
 from climatoology.base.i18n import N_
 from pydantic import BaseModel
 
-emissions_aoi = pd.read_csv('./resources/min_co2_kt_sum.csv')
-city_pop_2020 = pd.read_csv('./resources/aoi_pop_now.csv')
-aoi_emission_end_years = pd.read_csv('./resources/aoi_emission_end_year.csv')
+from ghg_budget.components.cache import fingerprint
+from ghg_budget.components.static_resources import RESOURCES_DIR
 
+log = logging.getLogger(__name__)
 
-@dataclass
+SNAPSHOT_PATH = RESOURCES_DIR / 'data_snapshot.npz'
+
+EMISSION_CATEGORIES = ['estimation', 'projection']
+INTEGER_COLUMNS = ['Year', 'pop_2020', 'end_year']
+
+
+class CityRegistry:
+    """
+    Index of the per-AOI data by AOI name and year.
+
+    All lookups are dictionary accesses and return NumPy views or scalars, so they take constant time regardless of the
+    number of AOIs and years. The emissions ordered by reported (estimation) and projected years are computed once.
+    """
+
+    def __init__(
+        self,
+        emissions_aoi: pd.DataFrame,
+        city_pop_2020: pd.DataFrame | None = None,
+        aoi_emission_end_years: pd.DataFrame | None = None,
+    ):
+        self.cities = [column for column in emissions_aoi.columns if column not in ('Year', 'category')]
+        self.years = emissions_aoi['Year'].to_numpy()
+        self.index = emissions_aoi.index
+        # The first row of a year wins, like a boolean mask lookup followed by .values[0]
+        self._year_positions = {year: position for position, year in reversed(list(enumerate(self.years.tolist())))}
+        self._emissions = {city: emissions_aoi[city].to_numpy() for city in self.cities}
+        self._year_emissions = emissions_aoi[self.cities].to_numpy()
+
+        if 'category' in emissions_aoi.columns:
+            category = emissions_aoi['category'].to_numpy()
+            self.estimation_positions = np.flatnonzero(category == 'estimation')
+            self.projection_positions = np.flatnonzero(category == 'projection')
+        else:
+            self.estimation_positions = np.arange(len(self.years))
+            self.projection_positions = np.array([], dtype=int)
+
+        # Reported years first. Each AOI is reordered once into read-only arrays, the sums of its reported and projected
+        # emissions are precomputed.
+        self.ordered_positions = np.r_[self.estimation_positions, self.projection_positions]
+        self.ordered_years = self.years[self.ordered_positions]
+        self.ordered_index = self.index[self.ordered_positions]
+        self._ordered = {}
+        self._cumulative = {}
+        self._totals = {}
+        reported = self.estimation_positions.size
+        for city, values in self._emissions.items():
+            ordered = values[self.ordered_positions]
+            cumulative = np.nancumsum(ordered)
+            if np.issubdtype(ordered.dtype, np.floating):
+                cumulative[np.isnan(ordered)] = np.nan
+            ordered.flags.writeable = cumulative.flags.writeable = False
+            self._ordered[city] = ordered
+            self._cumulative[city] = cumulative
+            self._totals[city] = (np.nansum(ordered[:reported]), np.nansum(ordered[reported:]))
+
+        self._population = {}
+        if city_pop_2020 is not None:
+            self._population = dict(zip(city_pop_2020['city_name'], city_pop_2020['pop_2020'].to_numpy()))
+        self._end_year = {}
+        if aoi_emission_end_years is not None:
+            self._end_year = dict(
+                zip(aoi_emission_end_years['city_name'], aoi_emission_end_years['end_year'].to_numpy())
+            )
+
+    def population(self, city_name: str) -> int:
+        return int(self._population[city_name])
+
+    def end_year(self, city_name: str) -> np.integer:
+        """
+        :param city_name: Name of the AOI
+        :return: Last year with reported emissions of the AOI
+        """
+        return self._end_year[city_name]
+
+    def emissions(self, city_name: str) -> np.ndarray:
+        """
+        :param city_name: Name of the AOI
+        :return: Yearly CO2 emissions of the AOI in the order of the emission table
+        """
+        return self._emissions[city_name]
+
+    def emission(self, city_name: str, year: int) -> np.number:
+        """
+        :param city_name: Name of the AOI
+        :param year: A year of the emission table
+        :return: CO2 emissions of the AOI in the year
+        """
+        return self._emissions[city_name][self._year_positions[year]]
+
+    def year_emissions(self, year: int) -> np.ndarray:
+        """
+        :param year: A year of the emission table
+        :return: CO2 emissions of all AOIs in the year, in the order of cities
+        """
+        return self._year_emissions[self._year_positions[year]]
+
+    def ordered_emissions(self, city_name: str) -> np.ndarray:
+        """
+        :param city_name: Name of the AOI
+        :return: Yearly CO2 emissions of the AOI, reported years first, see ordered_positions for their rows
+        """
+        return self._ordered[city_name]
+
+    def cumulative_emissions(self, city_name: str) -> np.ndarray:
+        """
+        :param city_name: Name of the AOI
+        :return: Cumulative CO2 emissions of the AOI in the order of ordered_emissions, NaN where emissions are missing
+        """
+        return self._cumulative[city_name]
+
+    def emission_totals(self, city_name: str) -> Tuple[np.number, np.number]:
+        """
+        :param city_name: Name of the AOI
+        :return: Sum of the reported and of the projected CO2 emissions of the AOI
+        """
+        return self._totals[city_name]
+
+
+class DataStore:
+    """
+    Lazily loads the AOI data tables on first use.
+
+    The CSV files are parsed and validated once, downcast to compact dtypes and written to a binary snapshot together
+    with a hash of the CSV files. Later processes read the snapshot instead, as long as the hash still matches the CSV
+    files. Otherwise the snapshot is rebuilt from the CSV files.
+    """
+
+    SOURCES = {
+        'emissions_aoi': 'min_co2_kt_sum.csv',
+        'city_pop_2020': 'aoi_pop_now.csv',
+        'aoi_emission_end_years': 'aoi_emission_end_year.csv',
+    }
+
+    def __init__(self, resources_dir: Path = RESOURCES_DIR, snapshot_path: Path | None = SNAPSHOT_PATH):
+        self.resources_dir = resources_dir
+        self.snapshot_path = snapshot_path
+        self._tables: dict[str, pd.DataFrame] | None = None
+        self._registry: CityRegistry | None = None
+        self._fingerprint: str | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def emissions_aoi(self) -> pd.DataFrame:
+        """
+        :return: Yearly CO2 emissions [kt] with the columns 'Year', 'category' and one column per AOI
+        """
+        return self.tables()['emissions_aoi']
+
+    @property
+    def city_pop_2020(self) -> pd.DataFrame:
+        """
+        :return: Population of each AOI with the columns 'city_name' and 'pop_2020'
+        """
+        return self.tables()['city_pop_2020']
+
+    @property
+    def aoi_emission_end_years(self) -> pd.DataFrame:
+        """
+        :return: Last year with reported emissions of each AOI with the columns 'city_name' and 'end_year'
+        """
+        return self.tables()['aoi_emission_end_years']
+
+    @property
+    def registry(self) -> CityRegistry:
+        """
+        :return: Index of the data tables by AOI name and year
+        """
+        if self._registry is None:
+            tables = self.tables()
+            with self._lock:
+                if self._registry is None:
+                    self._registry = CityRegistry(**tables)
+        return self._registry
+
+    def preload(self) -> CityRegistry:
+        """
+        Loads the data tables and builds the registry ahead of their first use, e.g. before forking worker processes.
+
+        :return: Index of the data tables by AOI name and year
+        """
+        return self.registry
+
+    def registry_for(self, emissions_aoi: pd.DataFrame) -> CityRegistry:
+        """
+        :param emissions_aoi: pd.DataFrame with the yearly CO2 emissions of the AOIs
+        :return: The registry of the data store for its own emission table, a new registry for any other table
+        """
+        if self._tables is not None and emissions_aoi is self._tables['emissions_aoi']:
+            return self.registry
+        return CityRegistry(emissions_aoi)
+
+    def tables(self) -> dict[str, pd.DataFrame]:
+        """
+        :return: The data tables by name, read-only as they are shared by all analyses
+        """
+        if self._tables is None:
+            with self._lock:
+                if self._tables is None:
+                    self._tables = {name: read_only_table(table) for name, table in self._load().items()}
+        return self._tables
+
+    def fingerprint(self) -> str:
+        """
+        :return: Content fingerprint of the data tables, computed once when they are loaded
+        """
+        if self._fingerprint is None:
+            tables = self.tables()
+            with self._lock:
+                if self._fingerprint is None:
+                    self._fingerprint = fingerprint(*tables.values())
+        return self._fingerprint
+
+    def source_hash(self) -> str:
+        """
+        :return: Hash of the content of all CSV files
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        for filename in self.SOURCES.values():
+            digest.update((self.resources_dir / filename).read_bytes())
+        return digest.hexdigest()
+
+    def build_snapshot(self) -> Path:
+        """
+        Parses the CSV files and (re)writes the snapshot.
+
+        :return: Path of the snapshot
+        """
+        assert self.snapshot_path is not None, 'The data store has no snapshot path.'
+        tables = self._read_csv_files()
+        self._write_snapshot(tables, self.source_hash())
+        return self.snapshot_path
+
+    def _load(self) -> dict[str, pd.DataFrame]:
+        source_hash = self.source_hash()
+        if self.snapshot_path is not None and self.snapshot_path.exists():
+            tables = self._read_snapshot(source_hash)
+            if tables is not None:
+                return tables
+
+        tables = self._read_csv_files()
+        if self.snapshot_path is not None:
+            try:
+                self._write_snapshot(tables, source_hash)
+            except OSError as e:
+                log.warning(f'Could not write the data snapshot to {self.snapshot_path}: {e}')
+        return tables
+
+    def _read_csv_files(self) -> dict[str, pd.DataFrame]:
+        log.debug(f'Reading data tables from {self.resources_dir}')
+        tables = {name: pd.read_csv(self.resources_dir / filename) for name, filename in self.SOURCES.items()}
+        validate_tables(**tables)
+        return {name: compact_table(table) for name, table in tables.items()}
+
+    def _read_snapshot(self, source_hash: str) -> dict[str, pd.DataFrame] | None:
+        with np.load(self.snapshot_path, allow_pickle=False) as snapshot:
+            if str(snapshot['source_hash']) != source_hash:
+                log.info(f'Data snapshot {self.snapshot_path} is outdated, rebuilding it from the CSV files')
+                return None
+            log.debug(f'Reading data tables from snapshot {self.snapshot_path}')
+            tables = {}
+            for name in self.SOURCES:
+                columns = snapshot[f'{name}/columns'].tolist()
+                tables[name] = compact_table(
+                    pd.DataFrame({column: snapshot[f'{name}/{i}'] for i, column in enumerate(columns)})
+                )
+        return tables
+
+    def _write_snapshot(self, tables: dict[str, pd.DataFrame], source_hash: str) -> None:
+        arrays = {'source_hash': np.array(source_hash)}
+        for name, table in tables.items():
+            arrays[f'{name}/columns'] = np.array(table.columns.tolist(), dtype=str)
+            for i, column in enumerate(table.columns):
+                values = table[column]
+                # Store text as fixed-width unicode, object arrays would require pickle
+                dtype = None if pd.api.types.is_numeric_dtype(values) else str
+                arrays[f'{name}/{i}'] = values.to_numpy(dtype=dtype)
+
+        # Write to a temporary file first so concurrent readers never see a partial snapshot
+        file_descriptor, temporary_path = tempfile.mkstemp(dir=self.snapshot_path.parent, suffix='.npz')
+        try:
+            with os.fdopen(file_descriptor, 'wb') as file:
+                np.savez(file, **arrays)
+            os.replace(temporary_path, self.snapshot_path)
+        except BaseException:
+            Path(temporary_path).unlink(missing_ok=True)
+            raise
+        log.debug(f'Wrote data snapshot to {self.snapshot_path}')
+
+
+def validate_tables(
+    emissions_aoi: pd.DataFrame, city_pop_2020: pd.DataFrame, aoi_emission_end_years: pd.DataFrame
+) -> None:
+    """
+    Checks the schema and consistency of the AOI data tables.
+
+    :param emissions_aoi: Yearly CO2 emissions of the AOIs
+    :param city_pop_2020: Population of the AOIs
+    :param aoi_emission_end_years: Last year with reported emissions of the AOIs
+    :raises ValueError: If a table does not match the expected schema
+    """
+    if emissions_aoi.columns[:2].tolist() != ['Year', 'category'] or emissions_aoi.shape[1] < 3:
+        raise ValueError("The emission table needs the columns 'Year', 'category' and at least one AOI.")
+    if not pd.api.types.is_integer_dtype(emissions_aoi['Year']) or emissions_aoi['Year'].duplicated().any():
+        raise ValueError('The years of the emission table need to be unique integers.')
+    unknown_categories = set(emissions_aoi['category']) - set(EMISSION_CATEGORIES)
+    if unknown_categories:
+        raise ValueError(f'Unknown emission categories: {sorted(unknown_categories)}')
+    cities = emissions_aoi.columns[2:]
+    non_numeric = [city for city in cities if not pd.api.types.is_numeric_dtype(emissions_aoi[city])]
+    if non_numeric:
+        raise ValueError(f'The emissions of {non_numeric} are not numeric.')
+
+    for table, column in [(city_pop_2020, 'pop_2020'), (aoi_emission_end_years, 'end_year')]:
+        if table.columns.tolist() != ['city_name', column] or not pd.api.types.is_integer_dtype(table[column]):
+            raise ValueError(f"Expected the columns 'city_name' and an integer column '{column}'.")
+        missing = sorted(set(cities) - set(table['city_name']))
+        if missing:
+            raise ValueError(f"The table with the column '{column}' lacks the AOIs {missing}.")
+    if (city_pop_2020['pop_2020'] <= 0).any():
+        raise ValueError('The population of all AOIs needs to be positive.')
+
+
+def compact_table(table: pd.DataFrame) -> pd.DataFrame:
+    """
+    Downcasts the year and population columns to the smallest integer type and the emission category to a categorical.
+
+    Emission values keep their type, so sums over them cannot overflow and stay exact.
+
+    :param table: Table to downcast
+    :return: Downcast copy of the table
+    """
+    table = table.copy()
+    for column in table.columns:
+        if column in INTEGER_COLUMNS:
+            table[column] = pd.to_numeric(table[column], downcast='integer')
+        elif column == 'category':
+            table[column] = pd.Categorical(table[column], categories=EMISSION_CATEGORIES)
+        elif column == 'city_name':
+            table[column] = table[column].astype(object)
+    return table
+
+
+def read_only_table(table: pd.DataFrame) -> pd.DataFrame:
+    """
+    Rebuilds the table from read-only copies of its columns, so setting values in it raises a ValueError.
+
+    :param table: Table to protect
+    :return: Read-only copy of the table
+    """
+    columns = {}
+    for column in table.columns:
+        values = table[column]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            codes = values.cat.codes.to_numpy(copy=True)
+            codes.flags.writeable = False
+            columns[column] = pd.Categorical.from_codes(codes, dtype=values.dtype)
+        else:
+            array = values.to_numpy(copy=True)
+            array.flags.writeable = False
+            columns[column] = array
+    return pd.DataFrame(columns, index=table.index, copy=False)
+
+
+DATA_STORE = DataStore()
+
+
+@dataclass(frozen=True)
 class GHGData:
+    """
+    Global CO2 budgets and emissions. The tables are made read-only, as they are shared by all analyses.
+    """
+
     budget_glob: pd.DataFrame
     emissions_glob: pd.DataFrame
     emission_reduction_years: Tuple[int, int]
 
+    def __post_init__(self):
+        object.__setattr__(self, 'budget_glob', read_only_table(self.budget_glob))
+        object.__setattr__(self, 'emissions_glob', read_only_table(self.emissions_glob))
+
 
 GHG_DATA = GHGData(
     budget_glob=pd.DataFrame(
@@ -79,3 +460,8 @@ class BudgetParams(BaseModel):
 NOW_YEAR = datetime.date.today().year
 
 EMISSION_PROJECTION_CITIES = ['Heidelberg', 'Bonn']  # cities where we have emission projections
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+    log.info(f'Wrote data snapshot to {DATA_STORE.build_snapshot()}')
@@ -0,0 +1,334 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+from ghg_budget.components.data import DATA_STORE, GHG_DATA, NOW_YEAR, BudgetParams, CityRegistry, GHGData
+
+# Last year of the alternative emission paths
+EMISSION_PATHS_END_YEAR = 2040
+# Temperature thresholds [°C] of the alternative emission paths, which keep them with 83 % probability
+EMISSION_PATH_THRESHOLDS = (1.7, 2.0)
+EMISSION_PATH_PROBABILITY = '83 %'
+
+
+class BudgetExhaustionIndex:
+    """
+    Lookup index over the cumulative emissions of the AOI to find when CO2 budgets are exhausted.
+
+    A budget is exhausted in the first year whose cumulative emissions exceed it. Searching the running maximum of the
+    cumulative emissions yields that year with a single np.searchsorted for any number of budgets, even if the yearly
+    emissions were negative at some point. Years without emission data are ignored.
+    """
+
+    def __init__(self, years: np.ndarray, cumulative_emissions: np.ndarray):
+        cumulative_emissions = np.asarray(cumulative_emissions, dtype=float)
+        valid = ~np.isnan(cumulative_emissions)
+        self.years = np.asarray(years)[valid]
+        self.cumulative_emissions = cumulative_emissions[valid]
+        self._running_max = np.maximum.accumulate(self.cumulative_emissions)
+
+    def positions(self, budgets: np.ndarray) -> np.ndarray:
+        """
+        :param budgets: Array with CO2 budgets [kt]
+        :return: Positions of the years in which the budgets are exhausted, len(self.years) if they are not exhausted
+        """
+        return np.searchsorted(self._running_max, np.asarray(budgets, dtype=float), side='right')
+
+    def year_spent(self, budgets: np.ndarray) -> np.ndarray:
+        """
+        :param budgets: Array with CO2 budgets [kt]
+        :return: Array with the years in which the budgets are exhausted, NaN if they are not exhausted
+        """
+        positions = self.positions(budgets)
+        spent = positions < self.years.size
+        years = np.full(positions.shape, np.nan)
+        years[spent] = self.years[positions[spent]]
+        return years
+
+
+def emission_path_coefficients(
+    budgets: np.ndarray, emissions_pledge_year: float | np.ndarray, pledge_year: int, zero_year: int
+) -> np.ndarray:
+    """
+    Solves the cubic emission paths for any number of CO2 budgets at once.
+
+    Each path f(t) = a*t³ + b*t² + c*t + d with t = year - pledge_year starts at the emissions of the pledge_year,
+    reaches zero with zero slope in the zero_year and integrates to the budget between pledge_year and zero_year.
+    All paths share the same 4x4 linear system, only the right-hand side differs, so NumPy solves them in one call.
+    Working in years relative to the pledge_year keeps the system well-conditioned. The paths deviate from the former
+    symbolic solution by less than 1e-7 of the pledge_year emissions, which is far below the displayed precision.
+
+    :param budgets: Array with CO2 budgets [kt] of the AOI from the pledge_year until the zero_year
+    :param emissions_pledge_year: CO2 emissions [kt] of the AOI in the pledge_year, or one value per budget
+    :param pledge_year: First year of the emission paths
+    :param zero_year: Year when the emission paths reach zero
+    :return: Array of shape (4, len(budgets)) with the polynomial coefficients, highest degree first
+    """
+    t = zero_year - pledge_year
+    system = np.array(
+        [
+            [0.0, 0.0, 0.0, 1.0],
+            [t**3, t**2, t, 1.0],
+            [3 * t**2, 2 * t, 1.0, 0.0],
+            [t**4 / 4, t**3 / 3, t**2 / 2, t],
+        ]
+    )
+    budgets = np.asarray(budgets, dtype=float)
+    rhs = np.zeros((4, budgets.size))
+    rhs[0] = emissions_pledge_year
+    rhs[3] = budgets
+    return np.linalg.solve(system, rhs)
+
+
+def evaluate_emission_paths(coefficients: np.ndarray, years: np.ndarray, pledge_year: int) -> np.ndarray:
+    """
+    Evaluates cubic emission paths with Horner's scheme.
+
+    :param coefficients: Array of shape (4, n) as returned by emission_path_coefficients
+    :param years: Array with the years to evaluate the paths for
+    :param pledge_year: First year of the emission paths
+    :return: Array of shape (len(years), n) with the yearly emissions [kt] of each path
+    """
+    t = (np.asarray(years) - pledge_year).astype(float)[:, np.newaxis]
+    return np.polyval(coefficients, t)
+
+
+def reduction_scenarios(
+    years: np.ndarray, current_emission: float | np.ndarray, budget_now: float | np.ndarray
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, float | np.ndarray, int | np.ndarray]:
+    """
+    Calculates three emission reduction scenarios that start with the current emissions, see emission_reduction.
+
+    The scenarios are accumulated sequentially along the years (cumsum/cumprod), so every value equals the former
+    year-by-year update. The emissions and budgets may be arrays with one value per AOI, in which case the yearly
+    arrays get one column per AOI.
+
+    :param years: Consecutive years of the scenarios, starting with the current year
+    :param current_emission: CO2 emissions [kt] of the AOI in the first year
+    :param budget_now: Remaining CO2 budget [kt] of the AOI for 2 °C with 83 % probability
+    :return: Yearly emissions with a linear and a percentage decrease and with unchanged emissions (business as usual)
+    :return: Yearly decrease of CO2 emissions [kt] in the linear decrease scenario
+    :return: Yearly decrease of CO2 emissions [%] in the percentage decrease scenario
+    """
+    current_emission = np.asarray(current_emission, dtype=float)
+    budget_now = np.asarray(budget_now, dtype=float)
+    n_years = np.round((2 * budget_now) / current_emission)
+    linear_decrease = current_emission / (n_years - 1)
+    percentage_decrease = np.trunc(current_emission / budget_now * 100).astype(int)
+
+    steps = (years.size - 1, *current_emission.shape)
+    first_year = np.ones((1, *current_emission.shape), dtype=bool)
+
+    # Linear emission decrease scenario: a year is only reported as long as the previous year was still above zero
+    decrease_linear = np.cumsum(
+        np.concatenate([current_emission[np.newaxis], np.broadcast_to(-linear_decrease, steps)]), axis=0
+    )
+    linear_active = np.logical_and.accumulate(np.concatenate([first_year, decrease_linear[:-1] > 0]), axis=0)
+    decrease_linear = np.where(linear_active, np.round(decrease_linear, 1), np.nan)
+
+    # Percentage emission decrease scenario
+    decrease_percentage = np.cumprod(
+        np.concatenate([current_emission[np.newaxis], np.broadcast_to(1 - current_emission / budget_now, steps)]),
+        axis=0,
+    )
+    decrease_percentage = np.round(decrease_percentage, 1)
+
+    # Business as usual scenario: emissions stay constant until the budget is exceeded, which is marked with a zero
+    emission_sum = np.cumsum(np.broadcast_to(current_emission, (years.size, *current_emission.shape)), axis=0)
+    below_budget = np.logical_and.accumulate(np.concatenate([first_year, emission_sum[1:] < budget_now]), axis=0)
+    business_as_usual = np.where(below_budget, current_emission, np.nan)
+    business_as_usual[~below_budget & np.concatenate([first_year, below_budget[:-1]])] = 0
+
+    decrease_linear[0] = decrease_percentage[0] = business_as_usual[0] = current_emission
+    if current_emission.ndim == 0:
+        return decrease_linear, decrease_percentage, business_as_usual, linear_decrease[()], int(percentage_decrease)
+    return decrease_linear, decrease_percentage, business_as_usual, linear_decrease, percentage_decrease
+
+
+def global_emission_sum(ghg_data: GHGData, budget_params: BudgetParams) -> float:
+    """
+    :param ghg_data: Global CO2 budgets and emissions
+    :param budget_params: Class for holding the parameters for CO2 budget calculation that might change
+    :return: Global CO2 emissions [kt] from the pledge_year until the year before the IPCC report
+    """
+    emissions_t = ghg_data.emissions_glob.loc[
+        budget_params.pledge_year : budget_params.ipcc_date.year - 1, 'emissions_t'
+    ]
+    return emissions_t.sum() / 1000
+
+
+def bisko_budgets(
+    global_budgets: np.ndarray, global_emission_sum: float, pop_share: float | np.ndarray, bisko_factor: float
+) -> np.ndarray:
+    """
+    :param global_budgets: Global CO2 budgets [kt] from the IPCC report onwards
+    :param global_emission_sum: Global CO2 emissions [kt] between the pledge_year and the IPCC report
+    :param pop_share: Share of the global population living in the AOI, or one share per AOI
+    :param bisko_factor: Share of the CO2 emissions of the AOI that is accounted for by the BISKO standard
+    :return: CO2 budgets [kt] of the AOI in the pledge_year per global budget, with one column per AOI for several
+        shares
+    """
+    assert 0 < bisko_factor < 1, (
+        'The BISKO factor is not between 0 and 1. Please check the population and emission data.'
+    )
+    return np.multiply.outer(global_budgets + global_emission_sum, pop_share) * bisko_factor
+
+
+def emission_path_rows(temperature_thresholds: np.ndarray, probabilities: np.ndarray) -> np.ndarray:
+    """
+    :param temperature_thresholds: Temperature thresholds of the global budgets
+    :param probabilities: Probabilities of the global budgets
+    :return: Rows of the global budgets of the alternative emission paths
+    """
+    return np.array(
+        [
+            np.flatnonzero((temperature_thresholds == threshold) & (probabilities == EMISSION_PATH_PROBABILITY))[0]
+            for threshold in EMISSION_PATH_THRESHOLDS
+        ]
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class BudgetResult:
+    """
+    Numeric results of the CO2 budget analysis of one AOI.
+
+    Budget arrays follow the rows of the global budgets, yearly arrays follow the years of the engine.
+    """
+
+    bisko_budgets_2016: np.ndarray
+    bisko_budgets_now: np.ndarray
+    consumed_year: np.ndarray
+    emission_path_years: np.ndarray
+    emission_paths: np.ndarray
+    reduction_years: np.ndarray
+    decrease_linear: np.ndarray
+    decrease_percentage: np.ndarray
+    business_as_usual: np.ndarray
+    linear_decrease: float
+    percentage_decrease: int
+    reported_emissions: float
+    projected_emissions: float
+
+
+@dataclass(frozen=True, slots=True)
+class BudgetEngine:
+    """
+    Inputs of the CO2 budget analysis of one AOI as contiguous arrays and scalars.
+
+    The analysis only uses NumPy, DataFrames are built from its results where artifacts need them. For parameter sweeps,
+    derive engines with dataclasses.replace, e.g. with another population or zero year, and run them.
+    """
+
+    temperature_thresholds: np.ndarray
+    probabilities: np.ndarray
+    global_budgets: np.ndarray
+    global_emission_sum: float
+    years: np.ndarray
+    emissions: np.ndarray
+    cumulative_emissions: np.ndarray
+    reported_emissions: float
+    projected_emissions: float
+    population: int
+    global_population: int
+    bisko_factor: float
+    pledge_year: int
+    zero_year: int
+    now_year: int
+    reduction_years: np.ndarray
+
+    @classmethod
+    def for_city(
+        cls,
+        city_name: str,
+        registry: CityRegistry | None = None,
+        ghg_data: GHGData = GHG_DATA,
+        budget_params: BudgetParams | None = None,
+        now_year: int = NOW_YEAR,
+    ) -> 'BudgetEngine':
+        """
+        :param city_name: Name of the AOI
+        :param registry: Per-AOI data, defaults to the registry of the data store
+        :param ghg_data: Global CO2 budgets and emissions
+        :param budget_params: Class for holding the parameters for CO2 budget calculation that might change
+        :param now_year: The current year
+        :return: Engine for the CO2 budget analysis of the AOI
+        """
+        registry = registry or DATA_STORE.registry
+        budget_params = budget_params or BudgetParams()
+        reported_emissions, projected_emissions = registry.emission_totals(city_name)
+        start_year, end_year = ghg_data.emission_reduction_years
+        return cls(
+            temperature_thresholds=ghg_data.budget_glob['Temperature threshold (°C)'].to_numpy(),
+            probabilities=ghg_data.budget_glob['Probability'].to_numpy(),
+            global_budgets=ghg_data.budget_glob['budget_glob'].to_numpy(),
+            global_emission_sum=global_emission_sum(ghg_data, budget_params),
+            years=registry.ordered_years,
+            emissions=registry.ordered_emissions(city_name),
+            cumulative_emissions=registry.cumulative_emissions(city_name),
+            reported_emissions=reported_emissions,
+            projected_emissions=projected_emissions,
+            population=registry.population(city_name),
+            global_population=budget_params.global_pop,
+            bisko_factor=budget_params.bisko_factor,
+            pledge_year=budget_params.pledge_year,
+            zero_year=budget_params.zero_year,
+            now_year=now_year,
+            reduction_years=np.arange(start_year, end_year + 1),
+        )
+
+    def emission(self, year: int) -> float:
+        """
+        :param year: A year of the emission data
+        :return: CO2 emissions [kt] of the AOI in the year
+        """
+        return self.emissions[np.flatnonzero(self.years == year)[0]]
+
+    def bisko_budgets_2016(self) -> np.ndarray:
+        """
+        :return: CO2 budgets [kt] of the AOI according to the BISKO standard in the pledge_year, per global budget
+        """
+        return bisko_budgets(
+            self.global_budgets, self.global_emission_sum, self.population / self.global_population, self.bisko_factor
+        )
+
+    def emission_path_rows(self) -> np.ndarray:
+        """
+        :return: Rows of the global budgets of the alternative emission paths
+        """
+        return emission_path_rows(self.temperature_thresholds, self.probabilities)
+
+    def run(self) -> BudgetResult:
+        """
+        :return: Results of the CO2 budget analysis of the AOI
+        """
+        budgets_2016 = self.bisko_budgets_2016()
+        budgets_now = budgets_2016 - self.cumulative_emissions[np.flatnonzero(self.years == self.now_year)[0]]
+        consumed_year = BudgetExhaustionIndex(self.years, self.cumulative_emissions).year_spent(budgets_2016)
+
+        coefficients = emission_path_coefficients(
+            budgets_2016[self.emission_path_rows()], self.emission(self.pledge_year), self.pledge_year, self.zero_year
+        )
+        path_years = np.arange(self.pledge_year, EMISSION_PATHS_END_YEAR + 1)
+        paths = evaluate_emission_paths(coefficients, path_years, self.pledge_year)
+
+        # The scenarios have to stay below the budget for 2 °C with 83 % probability, the last global budget
+        decrease_linear, decrease_percentage, business_as_usual, linear_decrease, percentage_decrease = (
+            reduction_scenarios(self.reduction_years, self.emission(self.reduction_years[0]), budgets_now[-1])
+        )
+
+        return BudgetResult(
+            bisko_budgets_2016=budgets_2016,
+            bisko_budgets_now=budgets_now,
+            consumed_year=consumed_year,
+            emission_path_years=path_years,
+            emission_paths=paths,
+            reduction_years=self.reduction_years,
+            decrease_linear=decrease_linear,
+            decrease_percentage=decrease_percentage,
+            business_as_usual=business_as_usual,
+            linear_decrease=linear_decrease,
+            percentage_decrease=percentage_decrease,
+            reported_emissions=self.reported_emissions,
+            projected_emissions=self.projected_emissions,
+        )
@@ -0,0 +1,45 @@
+import asyncio
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Coroutine, Sequence, TypeVar
+
+T = TypeVar('T')
+
+
+def run_ordered(tasks: Sequence[Callable[[], T]], max_workers: int = 1) -> list[T]:
+    """
+    Runs independent tasks and returns their results in the order of the tasks.
+
+    With more than one worker the tasks run concurrently in a thread pool. Each task runs in a copy of the caller's
+    context, so context variables such as the requested language are available within the task.
+
+    :param tasks: Functions without arguments to run
+    :param max_workers: Maximum number of threads, 1 runs the tasks serially in the calling thread
+    :return: Results of the tasks in the order of the tasks
+    """
+    if max_workers <= 1 or len(tasks) <= 1:
+        return [task() for task in tasks]
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(tasks))) as executor:
+        futures = [executor.submit(contextvars.copy_context().run, task) for task in tasks]
+        return [future.result() for future in futures]
+
+
+def run_coroutine(coroutine: Coroutine[Any, Any, T]) -> T:
+    """
+    Runs a coroutine to completion from synchronous code and returns its result.
+
+    The coroutine runs on a new event loop in the calling thread. If the calling thread already runs an event loop, the
+    coroutine runs on a new event loop in a separate thread instead, as event loops cannot be nested. In both cases it
+    runs in a copy of the caller's context.
+
+    :param coroutine: Coroutine to run
+    :return: Result of the coroutine
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coroutine)
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(contextvars.copy_context().run, asyncio.run, coroutine).result()
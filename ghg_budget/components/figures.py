@@ -1,22 +1,131 @@
+import functools
 import logging
 import math
 from enum import StrEnum
 
+import numpy as np
 import pandas as pd
-from climatoology.base.i18n import tr
+import plotly.io as pio
+from climatoology.base.i18n import N_, tr
 from plotly import graph_objects as go
 from plotly.graph_objs import Figure
 
-from ghg_budget.components.data import NOW_YEAR, BudgetParams
+from ghg_budget.components.data import DATA_STORE, NOW_YEAR, BudgetParams
 
 log = logging.getLogger(__name__)
 budget_params = BudgetParams()
 
+MARGIN = dict(t=30, b=60, l=80, r=30)
+# Precision of the chart data in compact charts, e.g. 0.1 kt for emissions, the precision of the rounded chart values
+COMPACT_DECIMALS = 1
+# Integer dtypes Plotly encodes as typed arrays, from the smallest
+COMPACT_INT_DTYPES = [np.int8, np.uint8, np.int16, np.uint16, np.int32, np.uint32]
+
+
+def build_figure(traces: list[dict], layout: dict, validate: bool = False) -> Figure:
+    """
+    Assembles a figure from plain trace and layout dicts, by default without validating every single property.
+
+    The dicts have to be in the normalised form Plotly's validation would produce (e.g. {'title': {'text': ...}}
+    instead of title=..., NumPy arrays instead of pd.Series), so the figure serializes to the same JSON as a validated
+    figure.
+
+    :param traces: Trace dicts including their 'type'
+    :param layout: Layout dict
+    :param validate: Whether to validate all properties like go.Figure does by default
+    :return: The figure
+    """
+    return go.Figure(data=traces, layout=layout, _validate=validate)
+
+
+@functools.cache
+def plotly_white_template() -> go.layout.Template:
+    """
+    :return: The 'plotly_white' layout template, resolved once and shared by all figures
+    """
+    return pio.templates['plotly_white']
+
+
+@functools.lru_cache(maxsize=16)
+def line_chart_layout(xaxis_title: str, yaxis_title: str, separators: str, template: bool = False) -> dict:
+    """
+    Layout of the line charts, built once per language (i.e. per combination of translated strings).
+
+    Callers must not modify the returned dict.
+
+    :param xaxis_title: Translated title of the x-axis
+    :param yaxis_title: Translated title of the y-axis
+    :param separators: Translated decimal and thousands separators
+    :param template: Whether to use the 'plotly_white' template instead of the default template
+    :return: Layout dict
+    """
+    layout = {
+        'margin': MARGIN,
+        'yaxis': {'tickformat': ',d', 'title': {'text': yaxis_title}},
+        'xaxis': {'title': {'text': xaxis_title}},
+        'separators': separators,
+    }
+    if template:
+        layout = {'template': plotly_white_template(), **layout}
+    return layout
+
+
+def column(values: pd.Series) -> np.ndarray:
+    """
+    :param values: Column of a table
+    :return: The values as NumPy array, as Plotly's validation would store them
+    """
+    return values.to_numpy()
+
+
+def compact_array(values, decimals: int = COMPACT_DECIMALS):
+    """
+    Rounds numeric data to the given precision and stores NumPy arrays in the smallest dtype that holds them, as Plotly
+    serializes them as base64 typed arrays. Whole numbers become integers, other values stay 64 bit floats, as 32 bit
+    floats would show as e.g. 12.300000190734863 in the hover labels. Lists stay lists, as the few values they hold
+    are shorter in JSON than in base64.
+
+    :param values: Data array of a trace
+    :param decimals: Number of decimals to round to
+    :return: The compact array, or the values unchanged if they are not numeric
+    """
+    array = np.asarray(values)
+    if array.ndim != 1 or array.size == 0 or not np.issubdtype(array.dtype, np.number):
+        return values
+
+    array = np.round(array.astype(np.float64), decimals)
+    if np.isfinite(array).all() and (array == np.round(array)).all():
+        for dtype in COMPACT_INT_DTYPES:
+            limits = np.iinfo(dtype)
+            if limits.min <= array.min() and array.max() <= limits.max:
+                array = array.astype(dtype)
+                break
+    return array if isinstance(values, np.ndarray) else array.tolist()
+
+
+def compact_figure(figure: Figure, decimals: int = COMPACT_DECIMALS) -> Figure:
+    """
+    :param figure: The figure to compact
+    :param decimals: Number of decimals to round the data to
+    :return: Copy of the figure with all data arrays of its traces compacted with compact_array
+    """
+    traces = []
+    for trace in figure.data:
+        trace_dict = trace.to_plotly_json()
+        traces.append(
+            {
+                key: compact_array(value, decimals) if isinstance(value, (list, tuple, np.ndarray)) else value
+                for key, value in trace_dict.items()
+            }
+        )
+    return build_figure(traces, figure.layout.to_plotly_json())
+
 
 def get_comparison_chart(comparison_chart_df: pd.DataFrame, aoi_emission_end_year: int) -> Figure:
     """
     :param aoi_emission_end_year:
-    :param comparison_chart_df: Dataframe with different CO2 budgets and planned CO2 emissions
+    :param comparison_chart_df: Dataframe with different CO2 budgets and planned CO2 emissions, labelled with the
+        untranslated temperature thresholds
     :return: Bar chart with different CO2 budgets and planned CO2 emissions
     """
     log.debug('Creating bar chart with different CO2 budgets and planned CO2 emissions.')
@@ -25,71 +134,54 @@ def get_comparison_chart(comparison_chart_df: pd.DataFrame, aoi_emission_end_yea
     temperature_bar = comparison_chart_df[~comparison_chart_df['Temperature threshold (°C)'].isin(stack_labels)]
     stacked_bar = comparison_chart_df[comparison_chart_df['Temperature threshold (°C)'].isin(stack_labels)]
     colors = ['gold', '#FF9913', 'red']
-    names = [tr('1.5 °C'), tr('1.7 °C'), tr('2.0 °C')]
-    fig = go.Figure()
-
-    for temperature, color in zip(names, colors):
-        subset = temperature_bar[temperature_bar['Temperature threshold (°C)'] == temperature]
-        fig.add_trace(
-            go.Bar(
-                x=subset['Temperature threshold (°C)'],
-                y=subset['BISKO CO₂-budget 2016 (1000 tons)'],
-                name=temperature,
-                marker_color=color,
-            )
-        )
-
-    fig.add_trace(
-        go.Bar(
-            x=[tr('Reported <br>& Projection')],
-            y=[
-                stacked_bar[stacked_bar['Temperature threshold (°C)'] == 'Reported'][
-                    'BISKO CO₂-budget 2016 (1000 tons)'
-                ].values[0]
-            ],
-            name=tr('Reported until {aoi_emission_end_year}').format(aoi_emission_end_year=aoi_emission_end_year),
-            marker_color='#696969',
+    thresholds = [N_('1.5 °C'), N_('1.7 °C'), N_('2.0 °C')]
+    budgets = stacked_bar.set_index('Temperature threshold (°C)')['BISKO CO₂-budget 2016 (1000 tons)']
+    stack_x = [tr('Reported <br>& Projection')]
+
+    traces = []
+    for threshold, color in zip(thresholds, colors):
+        subset = temperature_bar[temperature_bar['Temperature threshold (°C)'] == threshold]
+        traces.append(
+            {
+                'marker': {'color': color},
+                'name': tr(threshold),
+                'x': column(subset['Temperature threshold (°C)'].map(tr)),
+                'y': column(subset['BISKO CO₂-budget 2016 (1000 tons)']),
+                'type': 'bar',
+            }
         )
+    traces.append(
+        {
+            'marker': {'color': '#696969'},
+            'name': tr('Reported until {aoi_emission_end_year}').format(aoi_emission_end_year=aoi_emission_end_year),
+            'x': stack_x,
+            'y': [budgets['Reported']],
+            'type': 'bar',
+        }
     )
-
-    fig.add_trace(
-        go.Bar(
-            x=[tr('Reported <br>& Projection')],
-            y=[
-                stacked_bar[stacked_bar['Temperature threshold (°C)'] == 'Projection'][
-                    'BISKO CO₂-budget 2016 (1000 tons)'
-                ].values[0]
-            ],
-            name=tr('Projection'),
-            marker_color='#B0B0B0',
-        )
-    )
-
-    all_y = (
-        stacked_bar[stacked_bar['Temperature threshold (°C)'] == 'Reported'][
-            'BISKO CO₂-budget 2016 (1000 tons)'
-        ].values[0]
-        + stacked_bar[stacked_bar['Temperature threshold (°C)'] == 'Projection'][
-            'BISKO CO₂-budget 2016 (1000 tons)'
-        ].values[0]
+    traces.append(
+        {
+            'marker': {'color': '#B0B0B0'},
+            'name': tr('Projection'),
+            'x': stack_x,
+            'y': [budgets['Projection']],
+            'type': 'bar',
+        }
     )
-    y_min = 0
-    max_y = all_y.max()
 
+    max_y = budgets['Reported'] + budgets['Projection']
     tick_step = choose_step(max_y)
-
-    tick_vals = list(range(y_min, int(max_y) + tick_step, tick_step))
+    tick_vals = list(range(0, int(max_y) + tick_step, tick_step))
     tick_text = [f'{val:,.0f}'.replace(',', tr(',')) for val in tick_vals]
 
-    fig.update_layout(
-        barmode='stack',
-        yaxis=dict(title=tr('CO₂-emissions (1000 tons)'), tickvals=tick_vals, ticktext=tick_text),
-        showlegend=True,
-        legend_traceorder='normal',
-        margin=dict(t=30, b=60, l=80, r=30),
-    )
-
-    return fig
+    layout = {
+        'yaxis': {'tickvals': tick_vals, 'ticktext': tick_text, 'title': {'text': tr('CO₂-emissions (1000 tons)')}},
+        'legend': {'traceorder': 'normal'},
+        'margin': MARGIN,
+        'barmode': 'stack',
+        'showlegend': True,
+    }
+    return build_figure(traces, layout)
 
 
 def get_time_chart(
@@ -108,59 +200,44 @@ def get_time_chart(
 
     measured = emissions_df[(emissions_df['Year'] <= aoi_emission_end_year) & (emissions_df['Year'] <= max_year)]
     projected = emissions_df[(emissions_df['Year'] >= aoi_emission_end_year) & (emissions_df['Year'] <= max_year)]
-
-    fig = go.Figure()
-
-    fig.add_trace(
-        go.Scatter(
-            x=measured['Year'],
-            y=measured[city_name],
-            mode='lines+markers',
-            name=tr('Reported'),
-            line=dict(color='#696969'),
-        )
-    )
-
-    fig.add_trace(
-        go.Scatter(
-            x=projected['Year'],
-            y=projected[city_name],
-            mode='lines+markers',
-            name=tr('Projection'),
-            line=dict(color='#B0B0B0'),
-        )
-    )
-
-    fig.add_trace(
-        go.Scatter(
-            x=emission_paths_df['Year'],
-            y=round(emission_paths_df['1.7 °C'], 1),
-            mode='lines',
-            name=tr('1.7 °C'),
-            line=dict(dash='dash', color='#FF9913'),
-        )
-    )
-
-    fig.add_trace(
-        go.Scatter(
-            x=emission_paths_df['Year'],
-            y=round(emission_paths_df['2.0 °C'], 1),
-            mode='lines',
-            name=tr('2.0 °C'),
-            line=dict(dash='dot', color='red'),
-        )
-    )
-
-    fig.update_layout(
-        xaxis_title=tr('Year'),
-        yaxis_title=tr('CO₂-emissions (1000 tons)'),
-        template='plotly_white',
-        margin=dict(t=30, b=60, l=80, r=30),
-        yaxis_tickformat=',d',
-        separators=tr(',,'),
-    )
-
-    return fig
+    path_years = column(emission_paths_df['Year'])
+
+    traces = [
+        {
+            'line': {'color': '#696969'},
+            'mode': 'lines+markers',
+            'name': tr('Reported'),
+            'x': column(measured['Year']),
+            'y': column(measured[city_name]),
+            'type': 'scatter',
+        },
+        {
+            'line': {'color': '#B0B0B0'},
+            'mode': 'lines+markers',
+            'name': tr('Projection'),
+            'x': column(projected['Year']),
+            'y': column(projected[city_name]),
+            'type': 'scatter',
+        },
+        {
+            'line': {'color': '#FF9913', 'dash': 'dash'},
+            'mode': 'lines',
+            'name': tr('1.7 °C'),
+            'x': path_years,
+            'y': column(round(emission_paths_df['1.7 °C'], 1)),
+            'type': 'scatter',
+        },
+        {
+            'line': {'color': 'red', 'dash': 'dot'},
+            'mode': 'lines',
+            'name': tr('2.0 °C'),
+            'x': path_years,
+            'y': column(round(emission_paths_df['2.0 °C'], 1)),
+            'type': 'scatter',
+        },
+    ]
+    layout = line_chart_layout(tr('Year'), tr('CO₂-emissions (1000 tons)'), tr(',,'), template=True)
+    return build_figure(traces, layout)
 
 
 def get_cumulative_chart(emissions_df: pd.DataFrame, city_name: str, aoi_emission_end_year: int) -> Figure:
@@ -177,42 +254,41 @@ def get_cumulative_chart(emissions_df: pd.DataFrame, city_name: str, aoi_emissio
 
     log.debug('Creating bar chart with cumulative emissions in the AOI.')
 
-    emissions_df['Category'] = emissions_df['Year'].apply(
-        lambda x: Category.REPORTED if x <= aoi_emission_end_year else Category.ESTIMATE
-    )
+    years = column(emissions_df['Year'])
+    cumulative = column(emissions_df['cumulative_emissions'])
+    reported = years <= aoi_emission_end_year
     colors = {Category.REPORTED: '#696969', Category.ESTIMATE: '#B0B0B0'}
     max_year = emissions_df[['Year', city_name]].dropna()['Year'].max()
 
-    fig = go.Figure()
-
-    for category in Category:
-        filtered = emissions_df[(emissions_df['Category'] == category) & (emissions_df['Year'] <= max_year)]
-        fig.add_trace(
-            go.Bar(
-                x=filtered['Year'],
-                y=round(filtered['cumulative_emissions'], 0),
-                name=category,
-                marker_color=colors[category],
-            )
+    traces = []
+    for category, mask in [(Category.REPORTED, reported), (Category.ESTIMATE, ~reported)]:
+        mask = mask & (years <= max_year)
+        traces.append(
+            {
+                'marker': {'color': colors[category]},
+                'name': category,
+                'x': years[mask],
+                'y': np.round(cumulative[mask], 0),
+                'type': 'bar',
+            }
         )
 
-    all_y = emissions_df['cumulative_emissions'].round(0)
-    y_min = 0
-    max_y = all_y.max()
-
+    max_y = np.nanmax(np.round(cumulative, 0))
     tick_step = choose_step(max_y)
-
-    tick_vals = list(range(y_min, int(max_y) + tick_step, tick_step))
+    tick_vals = list(range(0, int(max_y) + tick_step, tick_step))
     tick_text = [f'{val:,.0f}'.replace(',', tr(',')) for val in tick_vals]
 
-    fig.update_layout(
-        barmode='group',
-        xaxis_title=tr('Year'),
-        yaxis=dict(title=tr('Total CO₂-emissions (1000 tons)'), tickvals=tick_vals, ticktext=tick_text),
-        margin=dict(t=30, b=60, l=80, r=30),
-    )
-
-    return fig
+    layout = {
+        'yaxis': {
+            'tickvals': tick_vals,
+            'ticktext': tick_text,
+            'title': {'text': tr('Total CO₂-emissions (1000 tons)')},
+        },
+        'margin': MARGIN,
+        'barmode': 'group',
+        'xaxis': {'title': {'text': tr('Year')}},
+    }
+    return build_figure(traces, layout)
 
 
 def get_emission_reduction_chart(
@@ -224,48 +300,55 @@ def get_emission_reduction_chart(
     :param emission_reduction_df: pd.DataFrame with three different emission reduction scenarios to meet the goal of 2°C warming
     :return: Plotly figure with three different emission reduction scenarios to meet the goal of 2°C warming
     """
-    fig = go.Figure()
-
-    fig.add_trace(
-        go.Scatter(
-            x=emission_reduction_df['Year'],
-            y=emission_reduction_df['decrease_percentage'],
-            mode='lines+markers',
-            name=tr('Emissions are reduced by <br>{percentage_decrease}% per year').format(
+    years = column(emission_reduction_df['Year'])
+    traces = [
+        {
+            'line': {'color': 'blue'},
+            'mode': 'lines+markers',
+            'name': tr('Emissions are reduced by <br>{percentage_decrease}% per year').format(
                 percentage_decrease=percentage_decrease
             ),
-            line=dict(color='blue'),
-        )
-    )
-    fig.add_trace(
-        go.Scatter(
-            x=emission_reduction_df['Year'],
-            y=emission_reduction_df['decrease_linear'],
-            mode='lines+markers',
-            name=tr('Emissions are reduced by<br>{linear_decrease},000 tons per year').format(
+            'x': years,
+            'y': column(emission_reduction_df['decrease_percentage']),
+            'type': 'scatter',
+        },
+        {
+            'line': {'color': 'magenta'},
+            'mode': 'lines+markers',
+            'name': tr('Emissions are reduced by<br>{linear_decrease},000 tons per year').format(
                 linear_decrease=round(linear_decrease)
             ),
-            line=dict(color='magenta'),
-        )
-    )
-    fig.add_trace(
-        go.Scatter(
-            x=emission_reduction_df['Year'],
-            y=emission_reduction_df['business_as_usual'],
-            mode='lines+markers',
-            name=tr('Business as usual'),
-            line=dict(color='#2ca02c'),
-        )
-    )
+            'x': years,
+            'y': column(emission_reduction_df['decrease_linear']),
+            'type': 'scatter',
+        },
+        {
+            'line': {'color': '#2ca02c'},
+            'mode': 'lines+markers',
+            'name': tr('Business as usual'),
+            'x': years,
+            'y': column(emission_reduction_df['business_as_usual']),
+            'type': 'scatter',
+        },
+    ]
+    layout = line_chart_layout(tr('Year'), tr('CO₂-emissions (1000 tons)'), tr(',,'))
+    return build_figure(traces, layout)
+
+
+def emission_growth_rates(emissions_aoi: pd.DataFrame, start_year: int, end_year: int) -> pd.Series:
+    """
+    Calculates the Compound Annual Growth Rate of the CO2 emissions of all AOIs at once.
 
-    fig.update_layout(
-        xaxis_title=tr('Year'),
-        yaxis_title=tr('CO₂-emissions (1000 tons)'),
-        margin=dict(t=30, b=60, l=80, r=30),
-        yaxis_tickformat=',d',
-        separators=tr(',,'),
-    )
-    return fig
+    :param emissions_aoi: pd.DataFrame with the columns 'Year', 'category' and the yearly CO2 emissions of each AOI
+    :param start_year: First year of the period
+    :param end_year: Last year of the period
+    :return: pd.Series with the average annual growth rate [%] of each AOI, sorted by AOI name
+    """
+    registry = DATA_STORE.registry_for(emissions_aoi)
+    start_emissions = pd.Series(registry.year_emissions(start_year), index=registry.cities, dtype=float)
+    end_emissions = pd.Series(registry.year_emissions(end_year), index=registry.cities, dtype=float)
+    growth_rates = ((end_emissions / start_emissions) ** (1 / (end_year - start_year)) - 1) * 100
+    return growth_rates.sort_index()
 
 
 def get_emission_growth_rates_chart(emissions_aoi: pd.DataFrame) -> Figure:
@@ -278,51 +361,33 @@ def get_emission_growth_rates_chart(emissions_aoi: pd.DataFrame) -> Figure:
         INCREASE = tr('Upward trend')
         DECREASE = tr('Downward trend')
 
-    cities = emissions_aoi.columns[2:].tolist()
-    cities.sort()
+    growth_rates = emission_growth_rates(emissions_aoi, budget_params.pledge_year, NOW_YEAR)
+    city_labels = column(growth_rates.index.str.title().to_series())
+    rates = column(growth_rates.round(1))
+    increasing = column(growth_rates > 0)
     colors = {Trend.INCREASE: 'red', Trend.DECREASE: 'green'}
 
-    fig = go.Figure()
-    legend_shown = {Trend.INCREASE: False, Trend.DECREASE: False}
-    for cities_name in cities:
-        first_year_emission = emissions_aoi.loc[emissions_aoi['Year'] == budget_params.pledge_year, cities_name].values[
-            0
-        ]
-        current_year_emission = emissions_aoi.loc[emissions_aoi['Year'] == NOW_YEAR, cities_name].values[0]
-        average_annual_growth_rate = (
-            ((current_year_emission / first_year_emission) ** (1 / (NOW_YEAR - budget_params.pledge_year))) - 1
-        ) * 100
-        category = Trend.INCREASE if average_annual_growth_rate > 0 else Trend.DECREASE
-
-        fig.add_trace(
-            go.Bar(
-                x=[cities_name.title()],
-                y=[round(average_annual_growth_rate, 1)],
-                name=category,
-                marker_color=colors[category],
-                showlegend=not legend_shown[category],
-            )
+    traces = []
+    for category, mask in [(Trend.DECREASE, ~increasing), (Trend.INCREASE, increasing)]:
+        # Keep a placeholder bar for trends without cities so that both trends are shown in the legend
+        traces.append(
+            {
+                'marker': {'color': colors[category]},
+                'name': category,
+                'showlegend': True,
+                'x': city_labels[mask] if mask.any() else [None],
+                'y': rates[mask] if mask.any() else [0],
+                'type': 'bar',
+            }
         )
-        legend_shown[category] = True
-
-        for category in Trend:
-            if category not in [trace.name for trace in fig.data]:
-                fig.add_trace(
-                    go.Bar(
-                        x=[None],
-                        y=[0],
-                        name=category,
-                        marker_color=colors[category],
-                        showlegend=True,
-                    )
-                )
-
-    fig.update_layout(
-        xaxis_title=tr('Cities'),
-        yaxis_title=tr('Emission reduction (%)'),
-        margin=dict(t=30, b=60, l=80, r=30),
-    )
-    return fig
+
+    layout = {
+        'xaxis': {'categoryarray': city_labels, 'categoryorder': 'array', 'title': {'text': tr('Cities')}},
+        'margin': MARGIN,
+        'yaxis': {'title': {'text': tr('Emission reduction (%)')}},
+        'barmode': 'relative',
+    }
+    return build_figure(traces, layout)
 
 
 def choose_step(y_max):
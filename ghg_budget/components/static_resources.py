@@ -0,0 +1,108 @@
+import contextvars
+import functools
+import logging
+from pathlib import Path
+from typing import Callable, TypeVar
+
+from climatoology.base.i18n import set_language
+from climatoology.base.plugin_info import DEFAULT_LANGUAGE
+from pydantic_extra_types.language_code import LanguageAlpha2
+
+log = logging.getLogger(__name__)
+
+RESOURCES_DIR = Path(__file__).parent.parent.parent / 'resources'
+LOCALES_DIR = RESOURCES_DIR / 'locales'
+LOCALIZED_DOCUMENTS = ['methodology', 'methodology_simple', 'purpose']
+
+T = TypeVar('T')
+
+
+class StaticResources:
+    """
+    Static assets of the plugin below the resources directory, read once.
+
+    The Markdown documents are held per locale. Documents missing in a locale are resolved to the document of the
+    default language when the resources are loaded, so lookups never touch the file system.
+    """
+
+    def __init__(self, resources_dir: Path = RESOURCES_DIR, default_language: LanguageAlpha2 = DEFAULT_LANGUAGE):
+        """
+        :param resources_dir: Directory of the static assets
+        :param default_language: Language whose documents are used for locales and languages without their own
+        """
+        self.resources_dir = resources_dir
+        self.default_language = default_language
+
+        locales_dir = resources_dir / 'locales'
+        self.locales = sorted(path.name for path in locales_dir.iterdir() if path.is_dir())
+        if default_language not in self.locales:
+            raise ValueError(f'The resources do not contain the default locale {default_language}.')
+
+        default_documents = self._read_documents(locales_dir / default_language)
+        missing = set(LOCALIZED_DOCUMENTS) - set(default_documents)
+        if missing:
+            raise ValueError(f'The default locale {default_language} is missing the documents {sorted(missing)}.')
+        self._documents = {
+            locale: default_documents | self._read_documents(locales_dir / locale) for locale in self.locales
+        }
+        log.debug(f'Loaded the static resources of the locales {self.locales} from {resources_dir}')
+
+    @staticmethod
+    def _read_documents(locale_dir: Path) -> dict[str, str]:
+        documents = {}
+        for document in LOCALIZED_DOCUMENTS:
+            path = locale_dir / f'{document}.md'
+            if path.is_file():
+                documents[document] = path.read_text()
+        return documents
+
+    def document(self, name: str, lang: LanguageAlpha2) -> str:
+        """
+        :param name: Name of the document, one of LOCALIZED_DOCUMENTS
+        :param lang: Requested language, falls back to the default language
+        :return: Markdown text of the document
+        """
+        return self._documents.get(lang, self._documents[self.default_language])[name]
+
+    def methodology_simple(self, lang: LanguageAlpha2) -> str:
+        return self.document('methodology_simple', lang)
+
+    @property
+    def icon_path(self) -> Path:
+        return self.resources_dir / 'info/icon.jpg'
+
+    @property
+    def sources_path(self) -> Path:
+        return self.resources_dir / 'info/sources.bib'
+
+    @property
+    def cities_path(self) -> Path:
+        return self.resources_dir / 'cities.geojson'
+
+
+@functools.cache
+def get_static_resources() -> StaticResources:
+    """
+    :return: Static resources of the plugin, loaded once per process
+    """
+    return StaticResources()
+
+
+def run_translated(lang: LanguageAlpha2, task: Callable[[], T]) -> T:
+    """
+    Runs the task with the translation of the language active, as the plugin infrastructure does for a compute request.
+
+    Outside of compute requests, e.g. during the warm-up or in the generator, tr() would otherwise return the texts of
+    the default language. The task runs in a copy of the current context, so the translation of the caller stays active
+    after it.
+
+    :param lang: Language to translate into
+    :param task: Function to run
+    :return: Result of the task
+    """
+
+    def translated_task() -> T:
+        set_language(lang=lang, localisation_dir=LOCALES_DIR)
+        return task()
+
+    return contextvars.copy_context().run(translated_task)
@@ -0,0 +1,127 @@
+import contextlib
+import json
+import logging
+import threading
+import time
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import ContextManager, Iterator
+
+log = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Span:
+    name: str
+    start_s: float
+    duration_s: float
+    thread: str
+
+
+class StageTimer:
+    """
+    Collects the durations of the stages of one compute request.
+
+    Spans may be recorded from several threads, e.g. while artifacts are built in parallel.
+    """
+
+    def __init__(self):
+        self._origin = time.perf_counter()
+        self._spans: list[Span] = []
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def span(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            with self._lock:
+                self._spans.append(
+                    Span(
+                        name=name,
+                        start_s=start - self._origin,
+                        duration_s=end - start,
+                        thread=threading.current_thread().name,
+                    )
+                )
+
+    def spans(self) -> list[Span]:
+        with self._lock:
+            return sorted(self._spans, key=lambda recorded: recorded.start_s)
+
+    def summary(self) -> dict:
+        """
+        :return: Total duration, the summed duration and count per stage and all spans in the order they started
+        """
+        spans = self.spans()
+        stages = {}
+        for recorded in spans:
+            stage = stages.setdefault(recorded.name, {'count': 0, 'total_s': 0.0})
+            stage['count'] += 1
+            stage['total_s'] += recorded.duration_s
+        return {
+            'total_s': time.perf_counter() - self._origin,
+            'stages': stages,
+            'spans': [asdict(recorded) for recorded in spans],
+        }
+
+
+_ACTIVE_TIMER: ContextVar[StageTimer | None] = ContextVar('ghg_budget_stage_timer', default=None)
+_NO_SPAN = contextlib.nullcontext()
+
+
+def span(name: str) -> ContextManager[None]:
+    """
+    Measures the duration of the enclosed stage if timing is enabled for the current request.
+
+    Without an active timer a shared no-op context manager is returned, so disabled timing costs a single context
+    variable lookup.
+
+    :param name: Name of the stage
+    :return: Context manager measuring the stage
+    """
+    timer = _ACTIVE_TIMER.get()
+    if timer is None:
+        return _NO_SPAN
+    return timer.span(name)
+
+
+@contextlib.contextmanager
+def request_timer(enabled: bool) -> Iterator[StageTimer | None]:
+    """
+    Activates a timer for all spans within the context, including spans in threads started via run_ordered.
+
+    :param enabled: Whether to time the request
+    :return: The active timer, None if timing is disabled
+    """
+    if not enabled:
+        yield None
+        return
+
+    timer = StageTimer()
+    token = _ACTIVE_TIMER.set(timer)
+    try:
+        yield timer
+    finally:
+        _ACTIVE_TIMER.reset(token)
+
+
+def report_timing(timer: StageTimer, output_file: Path | None = None) -> dict:
+    """
+    Logs the timing summary of a request as one record and optionally writes it to a JSON file.
+
+    :param timer: Timer of the request
+    :param output_file: Path of the JSON file, None to only log the summary
+    :return: The timing summary
+    """
+    summary = timer.summary()
+    stages = {name: round(stage['total_s'] * 1000, 2) for name, stage in summary['stages'].items()}
+    log.info(
+        f'Compute request took {summary["total_s"] * 1000:.2f} ms: {json.dumps(stages)}', extra={'timing': summary}
+    )
+    if output_file is not None:
+        output_file.write_text(json.dumps(summary, indent=2))
+    return summary
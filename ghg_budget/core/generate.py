@@ -0,0 +1,191 @@
+"""
+Generates the artifacts of every city, locale and level of detail outside the plugin infrastructure.
+
+Each combination is one job that runs the CO₂ budget analysis with the translation of its locale active and writes its
+artifacts to <output>/<city>/<locale>/<level of detail>/. The jobs run in a pool of processes. A report with the
+duration, the timing of each stage and the error, if any, of every job is written to <output>/report.json.
+
+Run from the repository root: poetry run python -m ghg_budget.core.generate --output <directory>
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+import traceback
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from climatoology.base.artifact import Artifact
+from climatoology.base.computation import ComputationResources
+from pydantic_extra_types.language_code import LanguageAlpha2
+
+from ghg_budget.components.artifact import DEFAULT_ENCODING, ArtifactEncoding
+from ghg_budget.components.calculate import co2_budget_analysis, get_artifacts
+from ghg_budget.components.data import DATA_STORE
+from ghg_budget.components.static_resources import get_static_resources, run_translated
+from ghg_budget.components.timing import request_timer, span
+from ghg_budget.core.input import DetailOption
+
+log = logging.getLogger(__name__)
+
+REPORT_FILENAME = 'report.json'
+MANIFEST_FILENAME = 'artifacts.json'
+
+
+@dataclass(frozen=True)
+class GenerationJob:
+    city_name: str
+    lang: str
+    level_of_detail: DetailOption
+
+    def directory(self, output_dir: Path) -> Path:
+        return output_dir / self.city_name / self.lang / self.level_of_detail
+
+
+@dataclass(frozen=True)
+class JobReport:
+    city_name: str
+    lang: str
+    level_of_detail: str
+    directory: str
+    artifacts: int
+    duration_s: float
+    stages: dict
+    error: str | None = None
+
+
+def generation_jobs(cities: list[str] | None = None, languages: list[str] | None = None) -> list[GenerationJob]:
+    """
+    :param cities: Cities to generate, all cities of the input data if None
+    :param languages: Locales to generate, all locales of the static resources if None
+    :return: One job per city, locale and level of detail
+    """
+    cities = cities or DATA_STORE.registry.cities
+    languages = languages or get_static_resources().locales
+    return [
+        GenerationJob(city_name=city_name, lang=lang, level_of_detail=level_of_detail)
+        for city_name in cities
+        for lang in languages
+        for level_of_detail in DetailOption
+    ]
+
+
+def run_job(job: GenerationJob, output_dir: Path, encoding: ArtifactEncoding = DEFAULT_ENCODING) -> JobReport:
+    """
+    Runs the analysis of one job with the translation of its locale active and writes its artifacts and their manifest.
+    Errors are reported, not raised, so one failing job does not stop the others.
+
+    :param job: The job to run
+    :param output_dir: Root directory of the generated artifacts
+    :param encoding: How to encode the artifacts into files
+    :return: Report of the job
+    """
+    directory = job.directory(output_dir)
+    directory.mkdir(parents=True, exist_ok=True)
+    # Stand-in for the computation resources of the plugin infrastructure
+    resources = ComputationResources(computation_id=uuid.uuid4(), computation_dir=directory)
+
+    def build_artifacts() -> list[Artifact]:
+        with span('co2_budget_analysis'):
+            analysis = co2_budget_analysis(job.city_name)
+        with span('get_artifacts'):
+            return get_artifacts(
+                resources,
+                *analysis[:5],
+                job.city_name,
+                *analysis[5:],
+                lang=LanguageAlpha2(job.lang),
+                level_of_detail=job.level_of_detail,
+                encoding=encoding,
+            )
+
+    artifacts = []
+    error = None
+    start = time.perf_counter()
+    with request_timer(True) as timer:
+        try:
+            artifacts = run_translated(LanguageAlpha2(job.lang), build_artifacts)
+            manifest = [artifact.model_dump(mode='json') for artifact in artifacts]
+            (directory / MANIFEST_FILENAME).write_text(json.dumps(manifest, indent=2))
+        except Exception:
+            error = traceback.format_exc()
+            log.exception(f'Generating {job} failed')
+    duration_s = time.perf_counter() - start
+
+    return JobReport(
+        city_name=job.city_name,
+        lang=job.lang,
+        level_of_detail=job.level_of_detail,
+        directory=str(directory.relative_to(output_dir)),
+        artifacts=len(artifacts),
+        duration_s=duration_s,
+        stages=timer.summary()['stages'],
+        error=error,
+    )
+
+
+def generate(
+    jobs: list[GenerationJob], output_dir: Path, processes: int = 1, encoding: ArtifactEncoding = DEFAULT_ENCODING
+) -> list[JobReport]:
+    """
+    Runs the jobs and writes the report of all jobs to the output directory.
+
+    :param jobs: The jobs to run
+    :param output_dir: Root directory of the generated artifacts, created if it does not exist
+    :param processes: Number of worker processes, 1 runs the jobs serially in the calling process
+    :param encoding: How to encode the artifacts into files
+    :return: Reports of the jobs in the order of the jobs
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+    start = time.perf_counter()
+
+    if processes <= 1 or len(jobs) <= 1:
+        reports = [run_job(job, output_dir, encoding) for job in jobs]
+    else:
+        # Load the input data before forking, so the worker processes share it instead of loading it each
+        DATA_STORE.preload()
+        with ProcessPoolExecutor(max_workers=min(processes, len(jobs))) as executor:
+            reports = list(executor.map(run_job, jobs, [output_dir] * len(jobs), [encoding] * len(jobs)))
+
+    failed = sum(report.error is not None for report in reports)
+    report = {
+        'total_s': time.perf_counter() - start,
+        'processes': processes,
+        'jobs': len(reports),
+        'failed': failed,
+        'reports': [asdict(job_report) for job_report in reports],
+    }
+    (output_dir / REPORT_FILENAME).write_text(json.dumps(report, indent=2))
+    log.info(
+        f'Generated {len(reports) - failed} of {len(reports)} jobs in {report["total_s"]:.2f} s '
+        f'with {processes} processes into {output_dir}'
+    )
+    return reports
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--output', type=Path, required=True, help='Directory to write the artifacts and report to')
+    parser.add_argument('--processes', type=int, default=os.cpu_count(), help='Number of worker processes')
+    parser.add_argument('--city', action='append', help='Only generate this city, may be repeated')
+    parser.add_argument('--language', action='append', help='Only generate this locale, may be repeated')
+    parser.add_argument('--compact-charts', action='store_true', help='Round the chart data to the displayed precision')
+    parser.add_argument('--gzip', action='store_true', help='Also write gzip-compressed copies of the artifact files')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+
+    encoding = ArtifactEncoding(compact_charts=args.compact_charts, gzip=args.gzip)
+    reports = generate(
+        generation_jobs(args.city, args.language), args.output, processes=args.processes, encoding=encoding
+    )
+    return int(any(report.error is not None for report in reports))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
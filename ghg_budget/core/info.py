@@ -1,21 +1,25 @@
+import functools
 from datetime import timedelta
-from pathlib import Path
 
 from climatoology.base.i18n import N_
 from climatoology.base.plugin_info import Concern, PluginAuthor, PluginInfo, generate_plugin_info
 from pydantic import HttpUrl
 
+from ghg_budget.components.static_resources import get_static_resources
 from ghg_budget.core.input import ComputeInput, DetailOption
 
 
+@functools.cache
 def get_info() -> PluginInfo:
     """
+    The info is generated once per process and shared by all callers, which must not modify it.
 
     :return: Info object with information about the plugin.
     """
+    static_resources = get_static_resources()
     info = generate_plugin_info(
         name='CO₂ Budget',
-        icon=Path('resources/info/icon.jpg'),
+        icon=static_resources.icon_path,
         authors=[
             PluginAuthor(
                 name='Veit Ulrich',
@@ -35,7 +39,7 @@ def get_info() -> PluginInfo:
         ],
         concerns={Concern.CLIMATE_ACTION__GHG_EMISSION, Concern.CLIMATE_ACTION__MITIGATION},
         teaser=N_('Calculation of urban CO₂-budgets to limit global warming to specific temperatures.'),
-        sources_library=Path('resources/info/sources.bib'),
+        sources_library=static_resources.sources_path,
         demo_input_parameters=ComputeInput(level_of_detail=DetailOption.EXTENDED),
         computation_shelf_life=timedelta(weeks=52),
     )
@@ -1,9 +1,10 @@
 # You may ask yourself why this file has such a strange name.
 # Well ... python imports: https://discuss.python.org/t/warning-when-importing-a-local-module-with-the-same-name-as-a-2nd-or-3rd-party-module/27799
+import functools
 import logging
+import time
 from typing import List
 
-import geopandas as gpd
 import shapely
 from climatoology.base.artifact import Artifact
 from climatoology.base.baseoperator import BaseOperator, AoiProperties
@@ -13,22 +14,75 @@ from climatoology.base.i18n import tr
 from climatoology.base.plugin_info import PluginInfo
 from pydantic_extra_types.language_code import LanguageAlpha2
 
-from ghg_budget.components.calculate import co2_budget_analysis, get_artifacts
+from ghg_budget.components.aoi import get_city_resolver
+from ghg_budget.components.static_resources import run_translated
+from ghg_budget.components.timing import report_timing, request_timer, span
 from ghg_budget.core.info import get_info
-from ghg_budget.core.input import ComputeInput
+from ghg_budget.core.input import ComputeInput, DetailOption
+from ghg_budget.core.settings import Settings
 
 log = logging.getLogger(__name__)
 
+# The analysis and artifact modules (pandas, Plotly) are imported on first use within the methods, so starting the
+# plugin and answering info requests does not pay for them. The warm-up imports them ahead of the first request.
+
 
 class GHGBudget(BaseOperator[ComputeInput]):
     def __init__(self):
         super().__init__()
-        log.debug('Initialised GHG Budget operator')
+        self.settings = Settings()
+        self.artifact_cache = None
+        if self.settings.artifact_cache_dir is not None:
+            from ghg_budget.components.artifact_cache import ArtifactDiskCache
+
+            self.artifact_cache = ArtifactDiskCache(
+                self.settings.artifact_cache_dir, max_bytes=self.settings.artifact_cache_max_mb * 1024**2
+            )
+        log.debug(f'Initialised GHG Budget operator with {self.settings}')
+
+    def warm_up(self, languages: List[LanguageAlpha2] | None = None) -> None:
+        """
+        Loads all data and builds the artifacts of every city and level of detail, so the first requests are served from
+        the caches. The artifacts of each language are built with its translation active, as in a compute request.
+
+        :param languages: Languages of the precomputed artifacts, the warm_up_languages setting if None
+        """
+        from ghg_budget.components.artifact import prerender_artifact_metadata
+        from ghg_budget.components.calculate import cached_artifact_payloads
+        from ghg_budget.components.data import DATA_STORE
+
+        languages = languages or self.settings.warm_up_languages
+        log.info(f'Warming up the GHG Budget operator in {[language.name for language in languages]}')
+        start = time.perf_counter()
+
+        get_info()
+        get_city_resolver()
+        cities = DATA_STORE.registry.cities
+        end_years = {city_name: DATA_STORE.registry.end_year(city_name) for city_name in cities}
+
+        def warm_up_language(language: LanguageAlpha2) -> None:
+            prerender_artifact_metadata(language, end_years)
+            for city_name in cities:
+                for level_of_detail in DetailOption:
+                    cached_artifact_payloads(
+                        city_name,
+                        lang=language,
+                        level_of_detail=level_of_detail,
+                        max_workers=self.settings.artifact_workers,
+                    )
+
+        for language in languages:
+            run_translated(language, functools.partial(warm_up_language, language))
+
+        log.info(
+            f'Warm-up for {len(languages)} languages, {len(cities)} cities and {len(DetailOption)} levels of detail '
+            f'took {time.perf_counter() - start:.2f} s'
+        )
 
     def info(self) -> PluginInfo:
         return get_info()
 
-    def compute(  # dead: disable
+    def compute(
         self,
         resources: ComputationResources,
         aoi: shapely.MultiPolygon,
@@ -37,51 +91,66 @@ class GHGBudget(BaseOperator[ComputeInput]):
         language: LanguageAlpha2,
         **kwargs,
     ) -> List[Artifact]:
+        from ghg_budget.components.artifact import ArtifactEncoding, write_artifacts, write_artifacts_overlapped
+        from ghg_budget.components.calculate import artifact_cache_key, cached_artifact_payloads
+
         log.info(f'Handling compute request: {params.model_dump()} in context: {resources} in {language.name}')
 
-        allowed_cities = ['Berlin', 'Bonn', 'Demo', 'Hamburg', 'Heidelberg', 'Karlsruhe']
-        if aoi_properties.name not in allowed_cities:
-            cities = gpd.read_file('resources/cities.geojson')
-            matching = cities.loc[cities.contains(aoi)]
-            if len(matching) == 1:
-                aoi_properties.name = matching.iloc[0]['name']
+        with request_timer(self.settings.timing) as timer:
+            allowed_cities = ['Berlin', 'Bonn', 'Demo', 'Hamburg', 'Heidelberg', 'Karlsruhe']
+            if aoi_properties.name not in allowed_cities:
+                with span('resolve_aoi'):
+                    matching_city = get_city_resolver().resolve(aoi)
+                if matching_city is not None:
+                    aoi_properties.name = matching_city
+                else:
+                    raise ClimatoologyUserError(
+                        tr(
+                            'The CO₂-budget-tool can currently only be applied to the following cities in Germany: '
+                            '{allowed_cities}. '
+                            'Please choose one of these cities as area of interest'
+                        ).format(allowed_cities=allowed_cities)
+                    )
+
+            if aoi_properties.name == 'Demo':
+                aoi_properties.name = 'Heidelberg'
+            city_name = aoi_properties.name
+            encoding = ArtifactEncoding(compact_charts=self.settings.compact_charts, gzip=self.settings.gzip_artifacts)
+
+            def artifact_payloads():
+                with span('artifact_payloads'):
+                    return cached_artifact_payloads(
+                        city_name,
+                        lang=language,
+                        level_of_detail=params.level_of_detail,
+                        max_workers=self.settings.artifact_workers,
+                    )
+
+            if self.artifact_cache is None:
+                payloads = artifact_payloads()
+                with span('write_artifacts'):
+                    if self.settings.overlap_artifact_io:
+                        artifacts = write_artifacts_overlapped(payloads, resources, encoding=encoding)
+                    else:
+                        artifacts = write_artifacts(
+                            payloads, resources, max_workers=self.settings.artifact_workers, encoding=encoding
+                        )
             else:
-                raise ClimatoologyUserError(
-                    tr(
-                        'The CO₂-budget-tool can currently only be applied to the following cities in Germany: '
-                        '{allowed_cities}. '
-                        'Please choose one of these cities as area of interest'
-                    ).format(allowed_cities=allowed_cities)
-                )
-
-        if aoi_properties.name == 'Demo':
-            aoi_properties.name = 'Heidelberg'
-        city_name = aoi_properties.name
-
-        (
-            aoi_bisko_budgets,
-            comparison_chart_df,
-            emissions_df,
-            emission_paths_df,
-            emission_reduction_df,
-            linear_decrease,
-            percentage_decrease,
-        ) = co2_budget_analysis(city_name)
-
-        artifacts = get_artifacts(
-            resources,
-            aoi_bisko_budgets,
-            comparison_chart_df,
-            emissions_df,
-            emission_paths_df,
-            emission_reduction_df,
-            city_name,
-            linear_decrease,
-            percentage_decrease,
-            lang=language,
-            level_of_detail=params.level_of_detail,
-        )
+                with span('cached_artifacts'):
+                    artifacts = self.artifact_cache.get_or_write(
+                        artifact_cache_key(
+                            city_name, lang=language, level_of_detail=params.level_of_detail, encoding=encoding
+                        ),
+                        artifact_payloads,
+                        resources,
+                        max_workers=self.settings.artifact_workers,
+                        encoding=encoding,
+                    )
+
+            log.debug(f'Returning {len(artifacts)} artifacts.')
 
-        log.debug(f'Returning {len(artifacts)} artifacts.')
+        if timer is not None:
+            timing_file = resources.computation_dir / 'timing.json' if self.settings.timing_file else None
+            report_timing(timer, output_file=timing_file)
 
         return artifacts
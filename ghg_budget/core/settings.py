@@ -0,0 +1,35 @@
+from pathlib import Path
+from typing import List
+
+from climatoology.base.plugin_info import DEFAULT_LANGUAGE
+from pydantic import Field
+from pydantic_extra_types.language_code import LanguageAlpha2
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class Settings(BaseSettings):
+    model_config = SettingsConfigDict(env_file='.env', extra='ignore')  # dead: disable
+
+    # Number of threads used to build and write the artifacts of a computation. 1 builds and writes them serially.
+    artifact_workers: int = Field(default=1, ge=1)
+    # Serialize the artifacts into a local staging directory and copy them into the computation directory concurrently,
+    # for slow or network-mounted computation directories. Replaces the threads of artifact_workers for writing.
+    overlap_artifact_io: bool = False
+    # Round the chart data to the displayed precision and store whole numbers as integer typed arrays
+    compact_charts: bool = False
+    # Additionally write a gzip-compressed copy <file>.gz of every artifact file, for file servers to send as is
+    gzip_artifacts: bool = False
+
+    # Log the duration of each stage of a compute request as one record
+    timing: bool = False
+    # Additionally write the durations to timing.json in the computation directory, requires timing to be enabled
+    timing_file: bool = False
+    # Load the data, run the analysis for every city and level of detail and fill the caches before accepting requests
+    warm_up: bool = False
+    # Languages the warm-up precomputes the artifacts in, as a JSON list, e.g. ["en", "de"]
+    warm_up_languages: List[LanguageAlpha2] = Field(default=[DEFAULT_LANGUAGE], min_length=1)
+
+    # Directory of the artifact cache shared by all worker processes of a host, None disables the cache
+    artifact_cache_dir: Path | None = None
+    # Size limit of the artifact cache in megabytes, the least recently used artifacts are evicted beyond it
+    artifact_cache_max_mb: int = Field(default=512, ge=1)
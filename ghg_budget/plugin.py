@@ -9,6 +9,8 @@ log = logging.getLogger(__name__)
 
 def init_plugin() -> int:
     operator = GHGBudget()
+    if operator.settings.warm_up:
+        operator.warm_up()
     log.info('Starting plugin')
     return start_plugin(operator=operator)
 
@@ -0,0 +1,23 @@
+import shapely
+
+from ghg_budget.components.aoi import CityResolver, get_city_resolver
+
+
+def test_city_resolver_resolve_many():
+    resolver = CityResolver(
+        names=['A', 'B', 'B'],
+        geometries=[shapely.box(0, 0, 10, 10), shapely.box(20, 0, 30, 10), shapely.box(25, 0, 35, 10)],
+    )
+    aois = [
+        shapely.box(1, 1, 2, 2),
+        shapely.box(21, 1, 22, 2),
+        shapely.box(26, 1, 27, 2),
+        shapely.box(5, 5, 15, 6),
+        shapely.box(50, 50, 51, 51),
+    ]
+    assert resolver.resolve_many(aois) == ['A', 'B', None, None, None]
+
+
+def test_get_city_resolver(default_aoi):
+    assert get_city_resolver().resolve(default_aoi) == 'Heidelberg'
+    assert get_city_resolver() is get_city_resolver()
@@ -0,0 +1,68 @@
+import os
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+from climatoology.base.artifact import ArtifactMetadata
+from climatoology.base.computation import ComputationScope
+
+from ghg_budget.components.artifact import ArtifactKind, ArtifactPayload
+from ghg_budget.components.artifact_cache import ArtifactDiskCache
+
+
+def table_payloads(filename: str = 'table') -> list[ArtifactPayload]:
+    return [
+        ArtifactPayload(
+            kind=ArtifactKind.TABLE,
+            metadata=ArtifactMetadata(name='Table', summary='Summary', filename=filename),
+            content=pd.DataFrame({'Year': [2016, 2017], 'emissions': [1.5, 2.5]}),
+        )
+    ]
+
+
+def test_artifact_disk_cache(tmp_path, compute_resources):
+    cache = ArtifactDiskCache(tmp_path, max_bytes=1024**2)
+    first = cache.get_or_write('abcd', table_payloads, compute_resources)
+
+    with ComputationScope(uuid.uuid4()) as resources:
+        second = cache.get_or_write('abcd', list, resources)
+        assert second == first
+        cached_files = sorted(path.name for path in resources.computation_dir.iterdir())
+        assert cached_files == sorted(path.name for path in compute_resources.computation_dir.iterdir())
+        for filename in cached_files:
+            assert os.path.samefile(resources.computation_dir / filename, cache.entry_dir('abcd') / filename)
+
+
+def test_artifact_disk_cache_eviction(tmp_path, compute_resources):
+    cache = ArtifactDiskCache(tmp_path, max_bytes=1)
+    cache.get_or_write('abcd', table_payloads, compute_resources)
+    cache.get_or_write('efgh', lambda: table_payloads('other_table'), compute_resources)
+    assert not cache.entry_dir('abcd').exists()
+    assert not cache.entry_dir('efgh').exists()
+    assert (compute_resources.computation_dir / 'other_table.csv').exists()
+    assert cache.size() == 0
+
+
+def test_artifact_disk_cache_concurrent(tmp_path):
+    cache = ArtifactDiskCache(tmp_path, max_bytes=1024**2)
+
+    def get_or_write(_) -> list:
+        with ComputationScope(uuid.uuid4()) as resources:
+            return cache.get_or_write('abcd', table_payloads, resources)
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(get_or_write, range(8)))
+
+    assert all(result == results[0] for result in results)
+    assert list((tmp_path / 'ab').iterdir()) == [cache.entry_dir('abcd')]
+    assert list((tmp_path / 'staging').iterdir()) == []
+
+
+def test_artifact_disk_cache_evicted_while_loading(tmp_path, compute_resources):
+    cache = ArtifactDiskCache(tmp_path, max_bytes=1024**2)
+    cache.get_or_write('abcd', lambda: table_payloads('a_table') + table_payloads('b_table'), compute_resources)
+    (cache.entry_dir('abcd') / 'b_table.csv').unlink()
+
+    with ComputationScope(uuid.uuid4()) as resources:
+        assert cache._load('abcd', resources) is None
+        assert list(resources.computation_dir.iterdir()) == []
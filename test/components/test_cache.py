@@ -0,0 +1,20 @@
+import pandas as pd
+
+from ghg_budget.components.cache import CacheInfo, LRUCache, fingerprint
+
+
+def test_lru_cache():
+    cache = LRUCache(maxsize=2)
+    assert cache.get_or_compute('a', lambda: 1) == 1
+    assert cache.get_or_compute('b', lambda: 2) == 2
+    assert cache.get_or_compute('a', lambda: -1) == 1
+    assert cache.get_or_compute('c', lambda: 3) == 3
+    assert cache.get_or_compute('b', lambda: -2) == -2
+    assert cache.info() == CacheInfo(hits=1, misses=4, maxsize=2, currsize=2)
+
+
+def test_fingerprint():
+    df = pd.DataFrame({'Year': [2016, 2017], 'category': ['estimation', 'projection']})
+    assert fingerprint(df, 1) == fingerprint(df.copy(), 1)
+    assert fingerprint(df, 1) != fingerprint(df, 2)
+    assert fingerprint(df) != fingerprint(df.assign(Year=[2016, 2018]))
@@ -1,9 +1,19 @@
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date
 
+import numpy as np
 import pandas as pd
+from plotly.graph_objects import Figure
+from pydantic_extra_types.language_code import LanguageAlpha2
 
 
+from ghg_budget.components.artifact import prerender_artifact_metadata, time_chart_metadata, write_artifacts
 from ghg_budget.components.calculate import (
+    ANALYSIS_CACHE,
+    ARTIFACT_CACHE,
+    BudgetExhaustionIndex,
+    cached_artifact_payloads,
+    cached_co2_budget_analysis,
     calculate_bisko_budgets,
     comparison_chart_data,
     year_budget_spent,
@@ -11,11 +21,19 @@ from ghg_budget.components.calculate import (
     current_budget,
     simplify_table,
     emission_paths,
+    emission_path_coefficients,
+    evaluate_emission_paths,
     emission_reduction,
     co2_budget_analysis,
     format_table_data,
+    get_artifact_payloads,
+    get_emission_growth_rate_chart_artifact,
+    GROWTH_RATES_CHART_CACHE,
 )
-from ghg_budget.components.data import BudgetParams, city_pop_2020
+from ghg_budget.components.cache import fingerprint
+from ghg_budget.components.data import BudgetParams, DATA_STORE
+from ghg_budget.components.static_resources import run_translated
+from ghg_budget.core.input import DetailOption
 
 
 def test_co2_budget_analysis():
@@ -38,6 +56,127 @@ def test_co2_budget_analysis():
     assert isinstance(percentage_decrease, int)
 
 
+def test_cached_co2_budget_analysis():
+    first = cached_co2_budget_analysis('Heidelberg')
+    first[0]['BISKO CO₂-budget 2016 (1000 tons)'] = 0
+    second = cached_co2_budget_analysis('Heidelberg')
+    assert (second[0]['BISKO CO₂-budget 2016 (1000 tons)'] > 0).all()
+    pd.testing.assert_frame_equal(second[2], co2_budget_analysis('Heidelberg')[2])
+
+
+def test_cached_artifact_payloads(compute_resources):
+    first = cached_artifact_payloads('Bonn', LanguageAlpha2('en'), DetailOption.SIMPLE)
+    hits = ARTIFACT_CACHE.info().hits
+    second = cached_artifact_payloads('Bonn', LanguageAlpha2('en'), DetailOption.SIMPLE)
+    assert ARTIFACT_CACHE.info().hits == hits + 1
+    assert [payload.metadata for payload in second] == [payload.metadata for payload in first]
+
+    artifacts = write_artifacts(second, compute_resources)
+    assert len(artifacts) == 3
+
+
+def test_cached_artifact_payloads_languages(compiled_translations):
+    ANALYSIS_CACHE.clear()
+    ARTIFACT_CACHE.clear()
+
+    def comparison_chart(lang: str) -> Figure:
+        payloads = run_translated(
+            LanguageAlpha2(lang),
+            lambda: cached_artifact_payloads('Bonn', LanguageAlpha2(lang), DetailOption.EXTENDED),
+        )
+        return next(
+            payload.content for payload in payloads if payload.metadata.filename == 'comparison_emissions_budgets'
+        )
+
+    english = comparison_chart('en')
+    german = comparison_chart('de')
+
+    assert [trace.name for trace in german.data[:3]] == ['1,5 °C', '1,7 °C', '2,0 °C']
+    for english_trace, german_trace in zip(english.data, german.data):
+        assert len(german_trace.y) == 1
+        np.testing.assert_array_equal(german_trace.y, english_trace.y)
+
+
+def test_get_emission_growth_rate_chart_artifact():
+    first = get_emission_growth_rate_chart_artifact(LanguageAlpha2('en'))
+    hits = GROWTH_RATES_CHART_CACHE.info().hits
+    second = get_emission_growth_rate_chart_artifact(LanguageAlpha2('en'))
+    assert GROWTH_RATES_CHART_CACHE.info().hits == hits + 1
+    assert second is first
+
+
+def test_prerender_artifact_metadata():
+    lang = LanguageAlpha2('en')
+    aoi_emission_end_year = DATA_STORE.registry.end_year('Bonn')
+    prerender_artifact_metadata(lang, {'Bonn': aoi_emission_end_year})
+    hits = time_chart_metadata.cache_info().hits
+
+    analysis = co2_budget_analysis('Bonn')
+    payloads = get_artifact_payloads(
+        *analysis[:5], 'Bonn', *analysis[5:], lang=lang, level_of_detail=DetailOption.SIMPLE
+    )
+    assert time_chart_metadata.cache_info().hits == hits + 1
+    assert payloads[2].metadata is time_chart_metadata(lang, 'Bonn', aoi_emission_end_year)
+
+
+def test_co2_budget_analysis_concurrent():
+    def analysis_with_payloads(city_name: str) -> tuple:
+        analysis = co2_budget_analysis(city_name)
+        payloads = get_artifact_payloads(
+            *analysis[:5],
+            city_name,
+            *analysis[5:],
+            lang=LanguageAlpha2('en'),
+            level_of_detail=DetailOption.EXTENDED,
+        )
+        serialized_payloads = []
+        for payload in payloads:
+            if isinstance(payload.content, pd.DataFrame):
+                serialized_payloads.append((payload.metadata, payload.content.to_csv()))
+            elif isinstance(payload.content, Figure):
+                serialized_payloads.append((payload.metadata, payload.content.to_json()))
+            else:
+                serialized_payloads.append((payload.metadata, payload.content))
+        return analysis, serialized_payloads
+
+    cities = ['Berlin', 'Bonn', 'Hamburg', 'Heidelberg', 'Karlsruhe']
+    data_fingerprint = fingerprint(*DATA_STORE.tables().values())
+    serial = {city_name: analysis_with_payloads(city_name) for city_name in cities}
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        concurrent = list(executor.map(analysis_with_payloads, cities * 4))
+
+    for city_name, (analysis, serialized_payloads) in zip(cities * 4, concurrent):
+        expected_analysis, expected_payloads = serial[city_name]
+        for received, expected in zip(analysis, expected_analysis):
+            if isinstance(expected, pd.DataFrame):
+                pd.testing.assert_frame_equal(received, expected)
+            else:
+                assert received == expected
+        assert serialized_payloads == expected_payloads
+    assert fingerprint(*DATA_STORE.tables().values()) == data_fingerprint == DATA_STORE.fingerprint()
+
+
+def test_get_artifact_payloads_parallel():
+    analysis = co2_budget_analysis('Bonn')
+    payloads = get_artifact_payloads(
+        *analysis[:5],
+        'Bonn',
+        *analysis[5:],
+        lang=LanguageAlpha2('en'),
+        level_of_detail=DetailOption.EXTENDED,
+        max_workers=4,
+    )
+    assert [payload.metadata.filename for payload in payloads] == [
+        'ghg_budget_table',
+        'comparison_emissions_budgets',
+        'time_chart',
+        'cumulative_chart',
+        'emission_reduction_chart',
+        'emissions_growth_rates',
+    ]
+
+
 def test_calculate_bisko_budgets():
     budget_params = BudgetParams()
     budget = pd.DataFrame(
@@ -53,6 +192,7 @@ def test_calculate_bisko_budgets():
         },
         index=[2016, 2017, 2018, 2019, 2020, 2021, 2022],
     )
+    city_pop_2020 = DATA_STORE.city_pop_2020
     aoi_pop = int(city_pop_2020.loc[city_pop_2020['city_name'] == 'Heidelberg', 'pop_2020'].values[0])
     aoi_pop_share = aoi_pop / budget_params.global_pop
     expected = pd.DataFrame(
@@ -195,6 +335,15 @@ def test_year_budget_spent_budget_not_spent():
     pd.testing.assert_frame_equal(received[0], expected)
 
 
+def test_budget_exhaustion_index():
+    exhaustion_index = BudgetExhaustionIndex(
+        years=np.array([2016, 2017, 2018, 2019, 2020]),
+        cumulative_emissions=np.array([500.0, 1000.0, 900.0, 2000.0, np.nan]),
+    )
+    budgets = np.array([250, 950, 1250, 5000])
+    np.testing.assert_array_equal(exhaustion_index.year_spent(budgets), [2016, 2017, 2019, np.nan])
+
+
 def test_simplify_table():
     aoi_bisko_budgets = pd.DataFrame(
         {
@@ -241,6 +390,21 @@ def test_emission_paths():
     assert round(emission_paths_df.loc[emission_paths_df['Year'] == 2040, '2.0 °C'].iloc[0]) == 0.0
 
 
+def test_emission_path_coefficients():
+    budgets = np.array([10000.0, 15000.0, 20000.0])
+    coefficients = emission_path_coefficients(budgets, 1000, 2016, 2040)
+    assert coefficients.shape == (4, 3)
+
+    years = np.arange(2016, 2041)
+    paths = evaluate_emission_paths(coefficients, years, 2016)
+    np.testing.assert_allclose(paths[0], [1000, 1000, 1000])
+    np.testing.assert_allclose(paths[-1], [0, 0, 0], atol=1e-9)
+    slope_zero_year = np.polyval(np.polyder(coefficients[:, 0]), 2040 - 2016)
+    assert abs(slope_zero_year) < 1e-9
+    integrals = [np.polyval(np.polyint(coefficients[:, i]), 2040 - 2016) for i in range(3)]
+    np.testing.assert_allclose(integrals, budgets)
+
+
 def test_emission_reduction():
     emission_reduction_years = (2025, 2027)
     emissions_table = pd.DataFrame(
@@ -281,6 +445,34 @@ def test_emission_reduction():
     assert received[2] == 17
 
 
+def test_emission_reduction_budget_exceeded():
+    emission_reduction_years = (2025, 2030)
+    emissions_table = pd.DataFrame(
+        {
+            'Year': [2025],
+            'heidelberg': [700],
+        },
+    )
+    city_name = 'heidelberg'
+    aoi_bisko_budgets = pd.DataFrame(
+        {
+            'BISKO CO₂-budget now (1000 tons)': [5000.0, 1750.0],
+        },
+    )
+    expected = pd.DataFrame(
+        {
+            'Year': [2025, 2026, 2027, 2028, 2029, 2030],
+            'decrease_linear': [700.0, 525.0, 350.0, 175.0, 0.0, np.nan],
+            'decrease_percentage': [700.0, 420.0, 252.0, 151.2, 90.7, 54.4],
+            'business_as_usual': [700.0, 700.0, 0.0, np.nan, np.nan, np.nan],
+        }
+    )
+    received = emission_reduction(emission_reduction_years, emissions_table, city_name, aoi_bisko_budgets)
+    pd.testing.assert_frame_equal(received[0], expected)
+    assert received[1] == 175.0
+    assert received[2] == 40
+
+
 def test_format_table_data():
     table_data = pd.DataFrame(
         {
@@ -0,0 +1,115 @@
+import shutil
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from ghg_budget.components.data import DATA_STORE, GHG_DATA, RESOURCES_DIR, CityRegistry, DataStore
+
+
+@pytest.fixture
+def resources_dir(tmp_path):
+    for filename in DataStore.SOURCES.values():
+        shutil.copy(RESOURCES_DIR / filename, tmp_path / filename)
+    return tmp_path
+
+
+def test_data_store_loads_lazily(resources_dir):
+    store = DataStore(resources_dir, snapshot_path=resources_dir / 'snapshot.npz')
+    assert not (resources_dir / 'snapshot.npz').exists()
+
+    emissions_aoi = store.emissions_aoi
+    assert (resources_dir / 'snapshot.npz').exists()
+    assert emissions_aoi.columns[:2].tolist() == ['Year', 'category']
+    assert emissions_aoi['Year'].dtype == 'int16'
+    assert isinstance(emissions_aoi['category'].dtype, pd.CategoricalDtype)
+
+
+def test_data_store_snapshot(resources_dir):
+    snapshot_path = resources_dir / 'snapshot.npz'
+    from_csv = DataStore(resources_dir, snapshot_path=snapshot_path).tables()
+    from_snapshot = DataStore(resources_dir, snapshot_path=snapshot_path).tables()
+    for name, table in from_csv.items():
+        pd.testing.assert_frame_equal(from_snapshot[name], table)
+
+
+def test_data_store_rebuilds_outdated_snapshot(resources_dir):
+    snapshot_path = resources_dir / 'snapshot.npz'
+    DataStore(resources_dir, snapshot_path=snapshot_path).build_snapshot()
+
+    city_pop = pd.read_csv(resources_dir / 'aoi_pop_now.csv')
+    city_pop['pop_2020'] = 1000
+    city_pop.to_csv(resources_dir / 'aoi_pop_now.csv', index=False)
+
+    store = DataStore(resources_dir, snapshot_path=snapshot_path)
+    assert (store.city_pop_2020['pop_2020'] == 1000).all()
+
+
+def test_data_store_validation(resources_dir):
+    city_pop = pd.read_csv(resources_dir / 'aoi_pop_now.csv')
+    city_pop.iloc[1:].to_csv(resources_dir / 'aoi_pop_now.csv', index=False)
+
+    with pytest.raises(ValueError, match='lacks the AOIs'):
+        DataStore(resources_dir, snapshot_path=None).tables()
+
+
+def test_city_registry():
+    emissions_aoi = pd.DataFrame(
+        {
+            'Year': [2016, 2017, 2018],
+            'category': ['estimation', 'estimation', 'projection'],
+            'heidelberg': [1.0, 2.0, 3.0],
+            'bonn': [4.0, 5.0, 6.0],
+        }
+    )
+    city_pop = pd.DataFrame({'city_name': ['bonn', 'heidelberg'], 'pop_2020': [300, 100]})
+    end_years = pd.DataFrame({'city_name': ['bonn', 'heidelberg'], 'end_year': [2017, 2016]})
+    registry = CityRegistry(emissions_aoi, city_pop, end_years)
+
+    assert registry.cities == ['heidelberg', 'bonn']
+    assert registry.population('bonn') == 300
+    assert registry.end_year('heidelberg') == 2016
+    assert registry.emission('bonn', 2017) == 5.0
+    np.testing.assert_array_equal(registry.year_emissions(2018), [3.0, 6.0])
+    assert registry.emission_totals('bonn') == (9.0, 6.0)
+    assert np.shares_memory(registry.emissions('bonn'), emissions_aoi['bonn'].to_numpy())
+
+
+def test_city_registry_split():
+    emissions_aoi = pd.DataFrame(
+        {
+            'Year': [2018, 2016, 2017],
+            'category': ['projection', 'estimation', 'estimation'],
+            'heidelberg': [3.0, 1.0, np.nan],
+        }
+    )
+    registry = CityRegistry(emissions_aoi)
+
+    np.testing.assert_array_equal(registry.ordered_years, [2016, 2017, 2018])
+    np.testing.assert_array_equal(registry.ordered_emissions('heidelberg'), [1.0, np.nan, 3.0])
+    np.testing.assert_array_equal(registry.cumulative_emissions('heidelberg'), [1.0, np.nan, 4.0])
+    assert registry.emission_totals('heidelberg') == (1.0, 3.0)
+    assert not registry.ordered_emissions('heidelberg').flags.writeable
+
+
+def test_data_store_registry_for():
+    assert DATA_STORE.registry_for(DATA_STORE.emissions_aoi) is DATA_STORE.registry
+    assert DATA_STORE.registry_for(DATA_STORE.emissions_aoi.copy()) is not DATA_STORE.registry
+
+
+def test_shared_tables_are_read_only(resources_dir):
+    store = DataStore(resources_dir, snapshot_path=None)
+    with pytest.raises(ValueError, match='read-only'):
+        store.emissions_aoi.iloc[0, 2] = 0.0
+    with pytest.raises(ValueError, match='read-only'):
+        store.emissions_aoi.loc[0, 'category'] = 'projection'
+    with pytest.raises(ValueError, match='read-only'):
+        store.city_pop_2020.loc[0, 'city_name'] = 'somewhere'
+    with pytest.raises(ValueError, match='read-only'):
+        GHG_DATA.budget_glob.loc[0, 'budget_glob'] = 0
+    with pytest.raises(ValueError, match='read-only'):
+        GHG_DATA.emissions_glob['emissions_t'].to_numpy()[0] = 0
+
+    emissions_aoi = store.emissions_aoi.copy()
+    emissions_aoi.iloc[0, 2] = 0.0
+    assert emissions_aoi.iloc[0, 2] != store.emissions_aoi.iloc[0, 2]
@@ -0,0 +1,71 @@
+import dataclasses
+
+import numpy as np
+
+from ghg_budget.components.calculate import budget_params
+from ghg_budget.components.engine import BudgetEngine, reduction_scenarios
+
+
+def test_budget_engine():
+    # Expected values of the SymPy based analysis the engine replaced, for Bonn in 2026
+    result = BudgetEngine.for_city('Bonn', budget_params=budget_params, now_year=2026).run()
+
+    np.testing.assert_allclose(
+        result.bisko_budgets_2016,
+        [
+            14822.730281834556,
+            12104.422310695169,
+            22977.65419525272,
+            18900.192238543637,
+            35210.04006537996,
+            28414.27013753149,
+        ],
+    )
+    np.testing.assert_allclose(
+        result.bisko_budgets_now,
+        [
+            -4896.269718165444,
+            -7614.577689304831,
+            3258.6541952527186,
+            -818.8077614563626,
+            15491.040065379959,
+            8695.270137531494,
+        ],
+    )
+    np.testing.assert_array_equal(result.consumed_year, [2023, 2021, 2031, 2026, np.nan, np.nan])
+    paths = dict(zip(result.emission_path_years, result.emission_paths))
+    np.testing.assert_allclose(
+        [paths[2016], paths[2025], paths[2030], paths[2039]],
+        [
+            [2239.0, 2239.0],
+            [946.9867357611656, 1643.8186039924622],
+            [438.7539469599724, 920.5142464637756],
+            [4.709216177463531, 12.623838901519775],
+        ],
+        rtol=1e-6,
+    )
+    assert abs(paths[2040]).max() < 1e-3
+    scenarios = dict(
+        zip(result.reduction_years, zip(result.decrease_linear, result.decrease_percentage, result.business_as_usual))
+    )
+    np.testing.assert_array_equal(scenarios[2025], [1264.0, 1264.0, 1264.0])
+    np.testing.assert_array_equal(scenarios[2031], [680.6, 492.5, 0.0])
+    np.testing.assert_array_equal(scenarios[2050], [np.nan, 24.9, np.nan])
+    assert (result.linear_decrease, result.percentage_decrease) == (97.23076923076923, 14)
+    np.testing.assert_allclose([result.reported_emissions, result.projected_emissions], [14370.0, 9772.4])
+
+
+def test_budget_engine_sweep():
+    engine = BudgetEngine.for_city('Heidelberg', budget_params=budget_params)
+    doubled = dataclasses.replace(engine, population=2 * engine.population).run()
+    np.testing.assert_allclose(doubled.bisko_budgets_2016, 2 * engine.run().bisko_budgets_2016)
+
+
+def test_reduction_scenarios():
+    decrease_linear, decrease_percentage, business_as_usual, linear_decrease, percentage_decrease = reduction_scenarios(
+        np.arange(2025, 2031), current_emission=100.0, budget_now=250.0
+    )
+    np.testing.assert_array_equal(decrease_linear, [100.0, 75.0, 50.0, 25.0, 0.0, np.nan])
+    np.testing.assert_array_equal(business_as_usual, [100.0, 100.0, 0.0, np.nan, np.nan, np.nan])
+    np.testing.assert_array_equal(decrease_percentage, [100.0, 60.0, 36.0, 21.6, 13.0, 7.8])
+    assert (linear_decrease, percentage_decrease) == (25.0, 40)
@@ -0,0 +1,35 @@
+import asyncio
+import contextvars
+import threading
+import time
+
+from ghg_budget.components.executor import run_coroutine, run_ordered
+
+language = contextvars.ContextVar('language', default='en')
+
+
+def test_run_ordered_serial():
+    tasks = [lambda: threading.current_thread(), lambda: threading.current_thread()]
+    assert run_ordered(tasks, max_workers=1) == [threading.current_thread()] * 2
+
+
+def test_run_ordered_parallel():
+    def task(i: int):
+        time.sleep(0.01 * (3 - i))
+        return i, language.get()
+
+    language.set('de')
+    tasks = [lambda i=i: task(i) for i in range(3)]
+    assert run_ordered(tasks, max_workers=3) == [(0, 'de'), (1, 'de'), (2, 'de')]
+
+
+def test_run_coroutine():
+    async def task():
+        return language.get()
+
+    async def nested():
+        return run_coroutine(task())
+
+    language.set('de')
+    assert run_coroutine(task()) == 'de'
+    assert asyncio.run(nested()) == 'de'
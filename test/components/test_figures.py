@@ -1,14 +1,23 @@
+import functools
+import json
+
 import numpy as np
 import pandas as pd
 
 from plotly.graph_objects import Figure
 
+from ghg_budget.components import figures
+from ghg_budget.components.calculate import co2_budget_analysis
+from ghg_budget.components.data import DATA_STORE
 from ghg_budget.components.figures import (
+    build_figure,
+    compact_figure,
     get_comparison_chart,
     get_time_chart,
     get_cumulative_chart,
     get_emission_reduction_chart,
     get_emission_growth_rates_chart,
+    emission_growth_rates,
     choose_step,
 )
 
@@ -87,6 +96,21 @@ def test_get_emission_growth_rates_chart():
 
     received = get_emission_growth_rates_chart(emissions_aoi)
     assert isinstance(received, Figure)
+    assert len(received.data) == 2
+
+
+def test_emission_growth_rates():
+    emissions_aoi = pd.DataFrame(
+        {
+            'Year': [2016, 2018],
+            'category': ['estimation', 'estimation'],
+            'karlsruhe': [100, 121],
+            'bonn': [100, 81],
+        }
+    )
+
+    received = emission_growth_rates(emissions_aoi, 2016, 2018)
+    pd.testing.assert_series_equal(received, pd.Series([-10.0, 10.0], index=['bonn', 'karlsruhe']), check_names=False)
 
 
 def test_choose_step():
@@ -96,3 +120,53 @@ def test_choose_step():
         step = choose_step(y_max)
         step_list.append(step)
     assert step_list == [1, 50, 200]
+
+
+def test_figures_serialize_like_validated_figures(monkeypatch):
+    city_name = 'Heidelberg'
+    (
+        _,
+        comparison_chart_df,
+        emissions_df,
+        emission_paths_df,
+        emission_reduction_df,
+        linear_decrease,
+        percentage_decrease,
+    ) = co2_budget_analysis(city_name)
+    end_year = DATA_STORE.registry.end_year(city_name)
+
+    def build_all_charts() -> list[Figure]:
+        return [
+            get_comparison_chart(comparison_chart_df, end_year),
+            get_time_chart(emissions_df, emission_paths_df, city_name, end_year),
+            get_cumulative_chart(emissions_df, city_name, end_year),
+            get_emission_reduction_chart(emission_reduction_df, linear_decrease, percentage_decrease),
+            get_emission_growth_rates_chart(DATA_STORE.emissions_aoi),
+        ]
+
+    fast = build_all_charts()
+    monkeypatch.setattr(figures, 'build_figure', functools.partial(build_figure, validate=True))
+    validated = build_all_charts()
+
+    for fast_figure, validated_figure in zip(fast, validated):
+        assert json.loads(fast_figure.to_json()) == json.loads(validated_figure.to_json())
+
+
+def test_compact_figure():
+    figure = build_figure(
+        [
+            {'type': 'scatter', 'x': np.arange(2016, 2020), 'y': np.array([1.04, 2.26, 3.0, np.nan])},
+            {'type': 'bar', 'x': ['1.5 °C'], 'y': np.array([1001.04, 300.0])},
+            {'type': 'bar', 'x': ['Reported'], 'y': [12.345]},
+        ],
+        {'title': {'text': 'Title'}},
+    )
+    compacted = compact_figure(figure)
+
+    assert compacted.layout == figure.layout
+    assert compacted.data[0].x.dtype == np.int16
+    np.testing.assert_array_equal(compacted.data[0].y, [1.0, 2.3, 3.0, np.nan])
+    assert compacted.data[1].x == ('1.5 °C',)
+    assert compacted.data[1].y.dtype == np.int16
+    np.testing.assert_array_equal(compacted.data[1].y, [1001, 300])
+    assert compacted.data[2].y == (12.3,)
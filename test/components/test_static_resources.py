@@ -0,0 +1,38 @@
+import pytest
+from pydantic_extra_types.language_code import LanguageAlpha2
+
+from ghg_budget.components.static_resources import StaticResources, get_static_resources
+
+
+@pytest.fixture
+def resources_dir(tmp_path):
+    for locale, documents in {'en': ['methodology', 'methodology_simple', 'purpose'], 'de': ['purpose']}.items():
+        (tmp_path / 'locales' / locale).mkdir(parents=True)
+        for document in documents:
+            (tmp_path / 'locales' / locale / f'{document}.md').write_text(f'{document} {locale}')
+    return tmp_path
+
+
+def test_static_resources(resources_dir):
+    static_resources = StaticResources(resources_dir)
+    assert static_resources.locales == ['de', 'en']
+    assert static_resources.document('purpose', LanguageAlpha2('de')) == 'purpose de'
+    assert static_resources.methodology_simple(LanguageAlpha2('de')) == 'methodology_simple en'
+    assert static_resources.document('methodology', LanguageAlpha2('fr')) == 'methodology en'
+
+
+def test_static_resources_missing_default_document(resources_dir):
+    (resources_dir / 'locales/en/purpose.md').unlink()
+    with pytest.raises(ValueError, match='purpose'):
+        StaticResources(resources_dir)
+
+
+def test_get_static_resources():
+    static_resources = get_static_resources()
+    assert static_resources is get_static_resources()
+    assert static_resources.icon_path.is_file()
+    assert static_resources.sources_path.is_file()
+    assert static_resources.cities_path.is_file()
+    assert static_resources.methodology_simple(LanguageAlpha2('de')) != static_resources.methodology_simple(
+        LanguageAlpha2('en')
+    )
@@ -0,0 +1,36 @@
+import json
+
+from ghg_budget.components.executor import run_ordered
+from ghg_budget.components.timing import report_timing, request_timer, span
+
+
+def test_span_without_timer():
+    with request_timer(enabled=False) as timer, span('stage'):
+        pass
+    assert timer is None
+
+
+def test_request_timer():
+    def task():
+        with span('task'):
+            return 1
+
+    with request_timer(enabled=True) as timer, span('stage'):
+        run_ordered([task, task], max_workers=2)
+
+    summary = timer.summary()
+    assert summary['stages']['stage']['count'] == 1
+    assert summary['stages']['task']['count'] == 2
+    assert summary['spans'][0]['name'] == 'stage'
+
+    with span('after_request'):
+        pass
+    assert 'after_request' not in timer.summary()['stages']
+
+
+def test_report_timing(tmp_path):
+    with request_timer(enabled=True) as timer, span('stage'):
+        pass
+
+    report_timing(timer, output_file=tmp_path / 'timing.json')
+    assert json.loads((tmp_path / 'timing.json').read_text())['stages']['stage']['count'] == 1
@@ -2,10 +2,13 @@ import uuid
 
 import pytest
 import shapely
+from babel.messages.mofile import write_mo
+from babel.messages.pofile import read_po
 from climatoology.base.baseoperator import AoiProperties
 from climatoology.base.computation import ComputationScope
 from shapely import Polygon
 
+from ghg_budget.components import static_resources
 from ghg_budget.core.input import DetailOption
 from ghg_budget.core.input import ComputeInput
 from ghg_budget.core.operator_worker import GHGBudget
@@ -48,3 +51,15 @@ def compute_resources():
 @pytest.fixture
 def operator():
     return GHGBudget()
+
+
+@pytest.fixture
+def compiled_translations(tmp_path, monkeypatch):
+    # Compile the message catalogs like the Docker image does, the repository only contains their sources
+    for po_path in static_resources.LOCALES_DIR.glob('*/LC_MESSAGES/messages.po'):
+        mo_path = tmp_path / po_path.relative_to(static_resources.LOCALES_DIR).with_suffix('.mo')
+        mo_path.parent.mkdir(parents=True)
+        with po_path.open('rb') as po_file, mo_path.open('wb') as mo_file:
+            write_mo(mo_file, read_po(po_file))
+    monkeypatch.setattr(static_resources, 'LOCALES_DIR', tmp_path)
+    return tmp_path
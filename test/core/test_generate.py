@@ -0,0 +1,41 @@
+import json
+
+from ghg_budget.core.generate import REPORT_FILENAME, generate, generation_jobs
+from ghg_budget.core.input import DetailOption
+
+
+def test_generation_jobs():
+    jobs = generation_jobs()
+    assert len(jobs) == len(set(jobs))
+    assert {job.lang for job in jobs} == {'de', 'en'}
+    assert {job.level_of_detail for job in jobs} == set(DetailOption)
+
+
+def test_generate(tmp_path):
+    jobs = generation_jobs(cities=['Heidelberg'], languages=['en'])
+    reports = generate(jobs, tmp_path, processes=2)
+
+    assert [(report.city_name, report.lang, report.level_of_detail) for report in reports] == [
+        (job.city_name, job.lang, job.level_of_detail) for job in jobs
+    ]
+    for job, report in zip(jobs, reports):
+        assert report.error is None
+        assert 'get_artifacts' in report.stages
+        manifest = json.loads((job.directory(tmp_path) / 'artifacts.json').read_text())
+        assert len(manifest) == report.artifacts > 0
+
+    report = json.loads((tmp_path / REPORT_FILENAME).read_text())
+    assert report['jobs'] == len(jobs)
+    assert report['failed'] == 0
+
+
+def test_generate_translated(tmp_path, compiled_translations):
+    jobs = generation_jobs(cities=['Heidelberg'], languages=['de'])
+    reports = generate(jobs, tmp_path, processes=2)
+
+    assert all(report.error is None for report in reports)
+    for job in jobs:
+        manifest = json.loads((job.directory(tmp_path) / 'artifacts.json').read_text())
+        names = {artifact['name'] for artifact in manifest}
+        assert 'CO₂ Budget Heidelberg' in names
+        assert 'Heidelberg CO₂ budget' not in names
@@ -0,0 +1,35 @@
+import subprocess
+import sys
+
+# Cold start budget for importing the plugin, see `python -X importtime -m ghg_budget.plugin`
+IMPORT_TIME_LIMIT_S = 2.0
+
+
+def import_times(module: str) -> dict[str, float]:
+    """
+    :param module: Module to import in a fresh interpreter
+    :return: Cumulative import time in seconds of every module imported along with it
+    """
+    process = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'], capture_output=True, text=True, check=True
+    )
+    times = {}
+    for line in process.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative_us, name = line.removeprefix('import time:').split('|')
+        times[name.strip()] = int(cumulative_us) / 1e6
+    return times
+
+
+def test_plugin_import_time():
+    times = import_times('ghg_budget.plugin')
+    assert times['ghg_budget.plugin'] < IMPORT_TIME_LIMIT_S
+    assert (
+        not {
+            'ghg_budget.components.calculate',
+            'ghg_budget.components.data',
+            'ghg_budget.components.figures',
+        }
+        & times.keys()
+    )
@@ -1,9 +1,21 @@
+import gzip
+import json
+import uuid
+
 from climatoology.base.artifact import Artifact
+from climatoology.base.computation import ComputationScope
 from climatoology.base.plugin_info import PluginInfo, DEFAULT_LANGUAGE
+from pydantic_extra_types.language_code import LanguageAlpha2
+
+from ghg_budget.components.artifact_cache import ArtifactDiskCache
+from ghg_budget.components.calculate import ARTIFACT_CACHE, cached_artifact_payloads
+from ghg_budget.core.input import DetailOption
+from ghg_budget.core.settings import Settings
 
 
 def test_plugin_info_request(operator):
     assert isinstance(operator.info(), PluginInfo)
+    assert operator.info() is operator.info()
 
 
 def test_plugin_compute_request(
@@ -19,3 +31,95 @@ def test_plugin_compute_request(
     assert len(computed_artifacts) == 6
     for artifact in computed_artifacts:
         assert isinstance(artifact, Artifact)
+
+
+def test_plugin_compute_request_timing(
+    operator, expected_compute_input, compute_resources, default_aoi, default_aoi_properties
+):
+    operator.settings = Settings(timing=True, timing_file=True)
+    operator.compute(
+        resources=compute_resources,
+        params=expected_compute_input,
+        aoi=default_aoi,
+        aoi_properties=default_aoi_properties,
+        language=DEFAULT_LANGUAGE,
+    )
+    timing = json.loads((compute_resources.computation_dir / 'timing.json').read_text())
+    assert 'artifact_payloads' in timing['stages']
+    assert 'write_artifacts' in timing['stages']
+
+
+def test_plugin_compute_request_artifact_cache(
+    operator, expected_compute_input, compute_resources, default_aoi, default_aoi_properties, tmp_path
+):
+    operator.settings = Settings(artifact_cache_dir=tmp_path)
+    operator.artifact_cache = ArtifactDiskCache(tmp_path, max_bytes=1024**2)
+    request = {
+        'params': expected_compute_input,
+        'aoi': default_aoi,
+        'aoi_properties': default_aoi_properties,
+        'language': DEFAULT_LANGUAGE,
+    }
+    computed_artifacts = operator.compute(resources=compute_resources, **request)
+    with ComputationScope(uuid.uuid4()) as resources:
+        assert operator.compute(resources=resources, **request) == computed_artifacts
+        assert len(list(resources.computation_dir.iterdir())) == len(computed_artifacts)
+
+
+def test_plugin_compute_request_overlap_artifact_io(
+    operator, expected_compute_input, compute_resources, default_aoi, default_aoi_properties
+):
+    request = {
+        'params': expected_compute_input,
+        'aoi': default_aoi,
+        'aoi_properties': default_aoi_properties,
+        'language': DEFAULT_LANGUAGE,
+    }
+    computed_artifacts = operator.compute(resources=compute_resources, **request)
+    operator.settings = Settings(overlap_artifact_io=True)
+    with ComputationScope(uuid.uuid4()) as resources:
+        assert operator.compute(resources=resources, **request) == computed_artifacts
+        for path in compute_resources.computation_dir.iterdir():
+            assert (resources.computation_dir / path.name).read_bytes() == path.read_bytes()
+
+
+def test_plugin_compute_request_encoding(
+    operator, expected_compute_input, compute_resources, default_aoi, default_aoi_properties
+):
+    operator.settings = Settings(compact_charts=True, gzip_artifacts=True)
+    computed_artifacts = operator.compute(
+        resources=compute_resources,
+        params=expected_compute_input,
+        aoi=default_aoi,
+        aoi_properties=default_aoi_properties,
+        language=DEFAULT_LANGUAGE,
+    )
+    compressed = list(compute_resources.computation_dir.glob('*.gz'))
+    assert len(compressed) == len(computed_artifacts)
+    for path in compressed:
+        assert gzip.decompress(path.read_bytes()) == path.with_suffix('').read_bytes()
+
+
+def test_plugin_warm_up(operator):
+    ARTIFACT_CACHE.clear()
+    operator.warm_up()
+    assert ARTIFACT_CACHE.info().currsize == 10
+
+
+def test_plugin_warm_up_languages(operator, compiled_translations):
+    ARTIFACT_CACHE.clear()
+    operator.settings = Settings(warm_up_languages=['en', 'de'])
+    operator.warm_up()
+    assert ARTIFACT_CACHE.info().currsize == 20
+
+    # Served from the cache, no translation is active here
+    names = {
+        lang: [
+            payload.metadata.name
+            for payload in cached_artifact_payloads('Heidelberg', lang=lang, level_of_detail=DetailOption.EXTENDED)
+        ]
+        for lang in [LanguageAlpha2('en'), LanguageAlpha2('de')]
+    }
+    assert ARTIFACT_CACHE.info().currsize == 20
+    assert 'Heidelberg CO₂ budget' in names['en']
+    assert 'CO₂ Budget Heidelberg' in names['de']